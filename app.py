@@ -1,152 +1,43 @@
+import os
+from datetime import datetime
+
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib
-import platform
-import plotly.graph_objects as go
+
+import perf
+from charts import FigureCache, cached_figure
+from dataset import SORT_OPTIONS, enable_copy_on_write, freeze_dataset, session_view
+from ingest import load_dataset
+from refresher import DatasetRefresher
+from sources import GvizSource
 
 
 # --- 데이터 로딩 ---
-sheet_id = '1cUZ9-bMzeokaAGb84YAh--KngCM0U0-9pJgXHXrJ0U8'
-sheet_names = [
-    '24.05.22', '24.06.07', '24.06.18', '24.06.26', '24.07.08', '24.07.18','24.07.31', '24.08.22',
-    '24.09.25', '24.10.22','24.11.02',  '24.11.14', '24.12.10',
-    '25.01.13', '25.02.03', '25.03.02','25.04.19', '25.05.23', '25.06.09', '25.07.12', '25.07.21', '25.08.06', '25.08.30', '25.09.21', '25.10.12','25.11.08', '25.11.23'
-]
+# 구글 시트 날짜 탭 원본. 탭 목록은 스프레드시트에서 자동으로 찾고, 조회에 실패했을 때만
+# sources.FALLBACK_SHEETS를 사용
+SOURCE = GvizSource()
+# 백그라운드에서 탭 목록을 다시 확인하는 주기(초). 새 탭이 생겼을 때만 데이터셋을 새로 만들어 교체
+REFRESH_INTERVAL = int(os.environ.get('BOODONGSAN_REFRESH_INTERVAL', 30 * 60))
+# 1이면 프로세스당 하나의 읽기 전용 데이터셋을 모든 세션이 복사 없이 공유 (0이면 세션마다 복사본)
+SHARED_DATASET = os.environ.get('BOODONGSAN_SHARED_DATASET', '1') != '0'
+# 세션 뷰(session_view)가 배열을 복사하지 않고 공유하려면 copy-on-write가 필요함 (pandas 2.x는 기본이 꺼짐)
+if SHARED_DATASET:
+    enable_copy_on_write()
+# 단지 선택 버튼을 한 페이지에 보여주는 수 (8열 x 6줄)
+SELECTOR_PAGE_SIZE = 48
 
 # 로컬 테스트방법
 #  .\.venv\Scripts\activate   가상환경 접속
+#  python ingest.py sheets   (선택) 데이터셋 아티팩트 미리 만들기
 #  streamlit run app.py   스트림릿 실행
 
 
 # 페이지를 넓게 사용하도록 설정
 st.set_page_config(layout="wide")
 
-# 한글 폰트 설정 - 클라우드 환경 대응
-@st.cache_resource
-def setup_korean_font():
-    """한글 폰트를 다운로드하고 설정하는 함수"""
-    import os
-    import urllib.request
-    import matplotlib.font_manager as fm
-    import subprocess
-    
-    try:
-        # 1. 시스템별 기본 폰트 시도
-        if platform.system() == 'Windows':
-            matplotlib.rc('font', family='Malgun Gothic')
-            matplotlib.rcParams['axes.unicode_minus'] = False
-            return "Windows font applied"
-        elif platform.system() == 'Darwin':  # Mac OS
-            matplotlib.rc('font', family='AppleGothic')
-            matplotlib.rcParams['axes.unicode_minus'] = False
-            return "Mac font applied"
-        else:  # Linux (Streamlit Cloud 환경)
-            # 먼저 시스템에 설치된 한글 폰트 확인
-            try:
-                # fontconfig 명령어로 한글 폰트 찾기
-                result = subprocess.run(['fc-list', ':lang=ko'], 
-                                      capture_output=True, text=True, timeout=10)
-                if result.returncode == 0 and result.stdout:
-                    # 나눔고딕이 있는지 확인
-                    if 'NanumGothic' in result.stdout:
-                        plt.rcParams['font.family'] = 'NanumGothic'
-                        plt.rcParams['axes.unicode_minus'] = False
-                        return "System NanumGothic font applied"
-                    # 다른 한글 폰트가 있는지 확인
-                    elif any(font in result.stdout for font in ['Nanum', 'Malgun', 'Gothic']):
-                        available_fonts = [f.name for f in fm.fontManager.ttflist]
-                        korean_fonts = [font for font in available_fonts 
-                                      if any(korean in font for korean in ['Nanum', 'Malgun', 'Gothic'])]
-                        if korean_fonts:
-                            plt.rcParams['font.family'] = korean_fonts[0]
-                            plt.rcParams['axes.unicode_minus'] = False
-                            return f"System Korean font applied: {korean_fonts[0]}"
-            except:
-                pass
-            
-            # fonts 디렉토리 생성
-            font_dir = './fonts'
-            if not os.path.exists(font_dir):
-                os.makedirs(font_dir)
-            
-            font_file = os.path.join(font_dir, 'NanumGothic.ttf')
-            
-            # 폰트 파일이 없으면 다운로드 시도
-            if not os.path.exists(font_file):
-                font_urls = [
-                    # Streamlit Cloud에서 접근 가능한 CDN들
-                    'https://cdn.jsdelivr.net/gh/naver/nanumfont@master/fonts/NanumGothic.ttf',
-                    'https://github.com/naver/nanumfont/raw/master/fonts/NanumGothic.ttf',
-                    'https://fonts.gstatic.com/s/nanumgothic/v17/PN_oRfi-oW3hYwmKDpKQmyOqd4mREJdOeWc.ttf'
-                ]
-                
-                font_downloaded = False
-                for i, font_url in enumerate(font_urls):
-                    try:
-                        with st.spinner(f"한글 폰트를 다운로드하고 있습니다... (시도 {i+1}/{len(font_urls)})"):
-                            # User-Agent 추가
-                            req = urllib.request.Request(
-                                font_url,
-                                headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-                            )
-                            with urllib.request.urlopen(req, timeout=30) as response:
-                                with open(font_file, 'wb') as f:
-                                    f.write(response.read())
-                            font_downloaded = True
-                            break
-                    except Exception as e:
-                        st.warning(f"폰트 다운로드 시도 {i+1} 실패: {e}")
-                        continue
-                
-                if not font_downloaded:
-                    # matplotlib의 기본 폰트 중 한글 지원하는 것 찾기
-                    available_fonts = [f.name for f in fm.fontManager.ttflist]
-                    # DejaVu Sans도 일부 한글 지원
-                    plt.rcParams['font.family'] = 'DejaVu Sans'
-                    plt.rcParams['axes.unicode_minus'] = False
-                    return "Default font applied - download failed"
-            
-            # 폰트 등록 및 설정
-            if os.path.exists(font_file):
-                try:
-                    # 폰트 매니저에 폰트 추가
-                    fm.fontManager.addfont(font_file)
-                    # 캐시 클리어 및 리빌드
-                    fm._load_fontmanager(try_read_cache=False)
-                    
-                    # 폰트 설정
-                    plt.rcParams['font.family'] = 'NanumGothic'
-                    plt.rcParams['axes.unicode_minus'] = False
-                    
-                    # 폰트가 제대로 로드되었는지 확인
-                    test_fonts = [f.name for f in fm.fontManager.ttflist if 'Nanum' in f.name]
-                    if test_fonts:
-                        return "Korean font downloaded and applied successfully"
-                    else:
-                        raise Exception("Font registration failed")
-                        
-                except Exception as e:
-                    st.warning(f"폰트 설정 실패: {e}")
-                    plt.rcParams['font.family'] = 'DejaVu Sans'
-                    plt.rcParams['axes.unicode_minus'] = False
-                    return "Default font applied - registration failed"
-            
-            # 최종 대안
-            plt.rcParams['font.family'] = 'DejaVu Sans'
-            plt.rcParams['axes.unicode_minus'] = False
-            return "Default font applied"
-        
-    except Exception as e:
-        st.error(f"폰트 설정 중 오류 발생: {e}")
-        plt.rcParams['font.family'] = 'DejaVu Sans'
-        plt.rcParams['axes.unicode_minus'] = False
-        return "Error - default font applied"
-
-# 폰트 설정 실행
-font_status = setup_korean_font()
-if "Korean font" not in font_status and "System Korean font" not in font_status:
-    st.info("💡 한글 폰트가 적용되지 않아 일부 텍스트가 □로 표시될 수 있습니다.")
+# 재실행 단위 단계별 시간 측정 (?debug=1 이면 페이지 아래에 측정표 표시)
+DEBUG_PANEL = st.query_params.get('debug') == '1'
+perf.start_run(scope='app')
 
 
 # --- CSS 및 JavaScript 스타일링 ---
@@ -364,265 +255,290 @@ document.addEventListener('DOMContentLoaded', function() {
 """, unsafe_allow_html=True)
 
 
-def convert_date(date_str):
-    return pd.to_datetime('20' + date_str, format='%Y.%m.%d')
-
-@st.cache_data
-def load_data():
-    all_data = []
-    for sheet in sheet_names:
-        try:
-            url = f'https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet}'
-            df = pd.read_csv(url)
-            df['날짜'] = convert_date(sheet)
-            all_data.append(df)
-        except Exception as e:
-            st.error(f"시트 '{sheet}' 로딩 중 오류 발생: {e}")
-    
-    if not all_data:
-        return pd.DataFrame(), pd.DataFrame()
-        
-    merged_df = pd.concat(all_data, ignore_index=True)
-    merged_df.sort_values('날짜', inplace=True)
-    merged_df['단지명_정제'] = merged_df['단지명'].str.replace(" ", "").str.strip()
-
-    # 숫자형으로 변환해야 할 모든 열을 처리
-    # '매매가', '전세가' 등은 '억' 단위의 실수(e.g., 15.2)로 가정
-    for col in ['매매가', '전고점', '전세가']:
-        if col in merged_df.columns:
-            merged_df[col] = pd.to_numeric(merged_df[col].astype(str).str.replace(',', ''), errors='coerce')
-
-    # 그래프에 필요한 모든 데이터 컬럼 계산
-    # '매매가'가 '억' 단위이므로 '평단가'를 '만원' 단위로 계산
-    merged_df['평단가'] = (merged_df['매매가'] * 10000) / 24
-    # '갭가격'은 '억' 단위로 계산됨
-    merged_df['갭가격'] = merged_df['매매가'] - merged_df['전세가']
-    merged_df['하락/상승률'] = ((merged_df['매매가'] / merged_df['전고점'] * 100) - 100).round(1)
-
-    # 가장 최신 데이터 추출
-    latest_date = merged_df['날짜'].max()
-    latest_df = merged_df[merged_df['날짜'] == latest_date].copy()
-    
-    return merged_df, latest_df
+def build_snapshot_dataset(sheets, warn):
+    """갱신기가 부르는 빌드 함수: (데이터셋, 불러오지 못한 탭)
 
-# 🔄 데이터 업데이트 버튼이 눌린 경우: 캐시 초기화 후 새로고침
+    백그라운드 스레드에서도 실행되므로 st.* 대신 warn으로 문제를 모아 두었다가 화면에서 보여줌.
+    """
+    perf.annotate('load_data', cache='miss')
+    # 미리 만든 아티팩트가 탭을 모두 담고 있으면 메모리 맵으로 읽고, 아니면 받아 둔 시트와 새 시트로 만듦
+    dataset, missing = load_dataset(SOURCE, sheets, warn=warn, error=warn)
+    # 공유 모드는 세션들이 같은 배열을 함께 보므로 교체 전에 읽기 전용으로 만듦
+    return (freeze_dataset(dataset) if SHARED_DATASET else dataset), missing
+
+@st.cache_resource
+def get_refresher():
+    """프로세스에 하나만 두는 데이터셋 갱신기 (세션은 기다리지 않고 마지막으로 완성된 데이터셋을 받음)"""
+    return DatasetRefresher(SOURCE.discover, build_snapshot_dataset, REFRESH_INTERVAL).start()
+
+@st.cache_data(max_entries=2)
+def load_copied_dataset(version):
+    """세션/재실행마다 역직렬화된 복사본을 받는 데이터셋 (데이터셋이 교체되면 version이 바뀜)"""
+    return get_refresher().current().dataset
+
+def load_data(snapshot):
+    if SHARED_DATASET:
+        # 재실행마다 복사하지 않고, 표만 얕은 복사로 감싸서 원본을 보호
+        return session_view(snapshot.dataset)
+    return load_copied_dataset(snapshot.dataset.version)
+
+def refresh_status(refresher, snapshot):
+    """마지막 갱신 시각 안내 문구"""
+    refreshed_at = snapshot.refreshed_at
+    minutes = int((datetime.now().astimezone() - refreshed_at).total_seconds() // 60)
+    text = f"데이터 갱신: {refreshed_at:%Y-%m-%d %H:%M} ({minutes}분 전)"
+    latest = snapshot.dataset.latest_df['날짜'].max() if len(snapshot.dataset.latest_df) else None
+    if latest is not None and not pd.isna(latest):
+        text += f" · 최신 시트 {latest:%Y-%m-%d}"
+    if refresher.refreshing:
+        text += " · 새 데이터 확인 중…"
+    elif refresher.last_checked is not None and (refresher.last_checked - refreshed_at).total_seconds() >= 60:
+        text += f" · 마지막 확인 {refresher.last_checked:%H:%M}"
+    return text
+
+refresher = get_refresher()
+
+# 🔄 데이터 업데이트 버튼이 눌린 경우: 백그라운드 갱신만 요청하고 지금 데이터로 바로 그림
+# (디스크에 저장된 시트는 그대로 두므로 새 시트만 다시 받고, 끝나면 다음 실행부터 새 데이터를 씀)
 if st.query_params.get("refresh") == "1":
-    st.cache_data.clear()
-    st.experimental_rerun()
+    refresher.request_refresh()
+    del st.query_params["refresh"]
 
-merged_df, latest_df = load_data()
+# 데이터셋이 이미 있으면 hit, 이 실행에서 처음 만들면 build_snapshot_dataset()에서 miss로 기록됨
+with perf.stage('load_data', cache='hit', shared=SHARED_DATASET) as load_info:
+    snapshot = refresher.current()
+    dataset = load_data(snapshot)
+    load_info['rows'] = len(dataset.merged_df)
+latest_df = dataset.latest_df
 
 if latest_df.empty:
+    for problem in snapshot.problems:
+        st.warning(problem)
     st.error("데이터를 불러오지 못했습니다. 구글 시트 ID나 네트워크 연결을 확인해주세요.")
     st.stop()
 
+st.caption(refresh_status(refresher, snapshot))
+if snapshot.problems or refresher.last_error:
+    with st.expander(f"⚠️ 데이터 로딩 경고 {len(snapshot.problems) + bool(refresher.last_error)}건"):
+        for problem in snapshot.problems:
+            st.write(problem)
+        if refresher.last_error:
+            st.write(f"마지막 갱신 실패 (이전 데이터를 계속 사용 중): {refresher.last_error}")
+
 # 세션 상태 초기화
 if 'selected' not in st.session_state:
     st.session_state.selected = set()
 if 'sort_option' not in st.session_state:
     st.session_state.sort_option = "평단가"
-
-# --- 상단 고정 헤더 영역 ---
-st.markdown("<div class='fixed-header'>", unsafe_allow_html=True)
-
-# 선택된 단지 정보 표시
-selected_display_names = [
-    latest_df[latest_df['단지명_정제'] == name_refined].iloc[0]['단지명']
-    for name_refined in st.session_state.selected
-    if not latest_df[latest_df['단지명_정제'] == name_refined].empty
-]
-selected_info_text = f"<strong>선택된 단지: {len(st.session_state.selected)}개</strong>"
-if selected_display_names:
-    selected_info_text += f" - {', '.join(selected_display_names)}"
-st.markdown(f"<div class='selected-info-bar'>{selected_info_text}</div>", unsafe_allow_html=True)
-
-
-# 단지 선택 버튼 목록
-st.markdown("<div class='button-container'>", unsafe_allow_html=True)
-
-# 정렬 기준에 따라 데이터프레임 정렬
-sort_map = {
-    "평단가": ("평단가", False),
-    "이름순": ("단지명_정제", True),
-    "갭가격": ("갭가격", False),
-    "총세대수": ("총세대수", False)
-}
-sort_key, ascending = sort_map.get(st.session_state.sort_option, ("평단가", False))
-if sort_key in latest_df.columns:
-    sortable_df = latest_df.dropna(subset=[sort_key]).copy()
-    sortable_df.sort_values(by=sort_key, ascending=ascending, inplace=True)
-else:
-    sortable_df = latest_df.copy()
-
-# 버튼들을 컬럼으로 감싸서 가로 배열 강제
-num_buttons = len(sortable_df)
-cols_per_row = 8  # 한 줄에 표시할 버튼 수
-num_rows = (num_buttons + cols_per_row - 1) // cols_per_row
-
-button_idx = 0
-for row in range(num_rows):
-    cols = st.columns(cols_per_row)
-    for col_idx in range(cols_per_row):
-        if button_idx < num_buttons:
-            row_data = sortable_df.iloc[button_idx]
-            name_refined = row_data.단지명_정제
-            display_name = row_data.단지명
-            value = ""
-            if st.session_state.sort_option == "평단가" and pd.notna(row_data.평단가):
-                value = f"({row_data.평단가:,.0f})"
-            elif st.session_state.sort_option == "갭가격" and pd.notna(row_data.갭가격):
-                value = f"({row_data.갭가격:,.1f})" # 갭가격은 소수점 표시
-            elif st.session_state.sort_option == "총세대수" and pd.notna(row_data.총세대수):
-                value = f"({int(row_data.총세대수):,}세대)"
-            
-            button_label = f"{display_name} {value}"
-            button_key = f"btn_{name_refined}"
-            is_selected = name_refined in st.session_state.selected
-            button_type = "primary" if is_selected else "secondary"
-            
-            with cols[col_idx]:
-                if st.button(button_label, key=button_key, type=button_type):
-                    if is_selected:
-                        st.session_state.selected.remove(name_refined)
-                    else:
-                        st.session_state.selected.add(name_refined)
-                    st.rerun()
-            button_idx += 1
-
-st.markdown("</div>", unsafe_allow_html=True) # button-container 닫기
-st.markdown("</div>", unsafe_allow_html=True) # fixed-header 닫기
-
-# --- 메인 콘텐츠 영역 ---
-st.markdown("<div class='main-content'>", unsafe_allow_html=True)
-
-st.markdown("<h1 style='text-align: center; margin-bottom: 20px;'>🏠 네이버 부동산 매물(전용59㎡) 단지별 가격 비교</h1>", unsafe_allow_html=True)
-
-# 정렬 기준 선택 라디오 버튼
-st.markdown("#### 정렬 기준 선택")
-sort_options = ["평단가", "이름순", "갭가격", "총세대수"]
-new_sort_option = st.radio(
-    "정렬 기준", 
-    options=sort_options, 
-    horizontal=True, 
-    label_visibility="collapsed", 
-    key='sort_radio_button',
-    index=sort_options.index(st.session_state.sort_option)
-)
-
-if new_sort_option != st.session_state.sort_option:
-    st.session_state.sort_option = new_sort_option
-    st.rerun()
-
-# 네비게이션 링크
-st.markdown("### [그래프 바로가기]")
-st.markdown("""
-<div class="nav-links">
-    <a href="#pyeongdan">📊 평단가</a>
-    <a href="#maemega">📊 매매가</a>
-    <a href="#jeonsega">📊 전세가</a>
-    <a href="#gapga">📊 갭가격</a>
-    <a href="#rate">📊 하락/상승률</a>
-</div>
-""", unsafe_allow_html=True)
+if 'selector_page' not in st.session_state:
+    st.session_state.selector_page = 0
 
 # --- 그래프 그리는 함수 ---
-def draw_graph(df, subject, selected_list, anchor_id):
-    st.markdown(f"<div id='{anchor_id}'></div>", unsafe_allow_html=True)
-    st.subheader(f"📈 {subject} 변화 그래프")
-
-    if not selected_list:
-        st.info("비교할 단지를 선택해주세요.")
-        return
-
-    unit_label = ""
-    if subject in ['매매가', '전세가', '갭가격']:
-        unit_label = "(억)"
-    elif subject == '평단가':
-        unit_label = "(만원)"
-    elif subject == '하락/상승률':
-        unit_label = "(%)"
-
-    fig = go.Figure()
-    has_data = False
-
-    # 기준 날짜(마지막 날짜)에서의 y값이 큰 순서로 정렬
-    traces = []
-    for name_refined in selected_list:
-        data = df[df['단지명_정제'] == name_refined].copy()
-        if not data.empty and subject in data.columns:
-            data.dropna(subset=['날짜', subject], inplace=True)
-            if not data.empty:
-                display_name = data.iloc[0]['단지명']
-                # 기준 날짜: x축에서 가장 마지막 값
-                last_y = data[subject].iloc[-1]
-                traces.append((last_y, name_refined, data, display_name))
-                has_data = True
-
-    # 기준 날짜의 y값이 큰 순서로 정렬
-    traces.sort(reverse=True, key=lambda x: x[0])
-
-    for _, name_refined, data, display_name in traces:
-        if subject == '평단가':
-            hovertemplate = (
-                f"단지명: {display_name}<br>날짜: %{{x}}<br>{subject}: %{{y:.1f}}{unit_label}<extra></extra>"
-            )
-        else:
-            hovertemplate = (
-                f"단지명: {display_name}<br>날짜: %{{x}}<br>{subject}: %{{y}}{unit_label}<extra></extra>"
-            )
-        fig.add_trace(
-            go.Scatter(
-                x=data['날짜'],
-                y=data[subject],
-                mode='lines+markers',
-                name=display_name,
-                marker=dict(size=8),
-                hovertemplate=hovertemplate
+@st.cache_resource
+def get_figure_cache():
+    """세션 간에 공유하는 그래프 캐시 (선택/정렬만 바뀐 재실행은 그래프를 다시 만들지 않음)"""
+    return FigureCache(maxsize=64)
+
+# --- 선택/정렬 콜백 ---
+# 버튼/라디오를 누르면 콜백에서 상태만 바꾸고, 그 위젯이 속한 프래그먼트만 다시 실행됨
+# (페이지 전체를 다시 실행하는 st.rerun()을 부르지 않음)
+def toggle_selection(name_refined):
+    if name_refined in st.session_state.selected:
+        st.session_state.selected.remove(name_refined)
+    else:
+        st.session_state.selected.add(name_refined)
+
+def change_sort():
+    st.session_state.sort_option = st.session_state.sort_radio_button
+    st.session_state.selector_page = 0
+
+def change_query():
+    st.session_state.selector_page = 0
+
+def move_page(step):
+    st.session_state.selector_page += step
+
+def clear_selection():
+    st.session_state.selected.clear()
+
+def display_with_rank(info):
+    # 최신 날짜 기준 평단가 백분위 (로딩 시 계산해 둔 값)
+    rank = info.get('평단가_백분위')
+    if rank is None or pd.isna(rank):
+        return info['단지명']
+    return f"{info['단지명']}(평단가 상위 {max(1, round((1 - rank) * 100))}%)"
+
+@st.fragment
+def draw_graph(dataset, subject, anchor_id, default_open=False):
+    """지표 하나의 그래프 영역 (펼치기 토글은 이 그래프만 다시 실행)"""
+    with perf.run_scope(scope='fragment'):
+        st.markdown(f"<div id='{anchor_id}'></div>", unsafe_allow_html=True)
+        st.subheader(f"📈 {subject} 변화 그래프")
+
+        selected = st.session_state.selected
+        if not selected:
+            st.info("비교할 단지를 선택해주세요.")
+            return
+
+        # 펼친 그래프만 만들고 전송 (닫힌 그래프는 계산/직렬화하지 않음)
+        if not st.toggle(f"{subject} 그래프 보기", value=default_open, key=f"show_{anchor_id}"):
+            return
+
+        market = dataset.market if st.session_state.get('show_market') else None
+        cache = get_figure_cache()
+        with perf.stage('draw_graph', subject=subject, selected=len(selected)) as info:
+            misses = cache.misses
+            fig, size = cached_figure(cache, dataset.series_index, subject, selected, dataset.version, market)
+            info['cache'] = 'miss' if cache.misses > misses else 'hit'
+            info['kb'] = round(size / 1024, 1)
+            if fig is not None:
+                st.plotly_chart(fig, width='stretch')
+                st.caption(f"그래프 데이터 {size / 1024:,.1f} KB")
+            else:
+                st.warning(f"선택된 단지에 대한 '{subject}' 데이터가 없습니다.")
+
+def debug_panel(run):
+    with st.expander("⏱️ 단계별 실행 시간", expanded=True):
+        st.caption(f"재실행 {run.run_id} ({run.fields.get('scope', 'app')}): {run.elapsed() * 1000:,.1f} ms")
+        st.dataframe(pd.DataFrame(run.events), width='stretch')
+        figure_cache = get_figure_cache()
+        st.caption(f"그래프 캐시: hit {figure_cache.hits} / miss {figure_cache.misses}")
+
+@st.fragment
+def selection_view(dataset):
+    """선택 헤더, 단지 버튼, 정렬, 그래프 영역
+
+    단지 선택/정렬을 바꾸면 이 프래그먼트만 다시 실행되고, 위쪽의 CSS/JS 주입과 데이터 로딩은 건너뜀.
+    """
+    with perf.run_scope(scope='fragment') as run:
+        # --- 상단 고정 헤더 영역 ---
+        st.markdown("<div class='fixed-header'>", unsafe_allow_html=True)
+
+        # 선택된 단지 정보 표시
+        # 로딩 시 만든 단지명_정제 -> 최신 정보 사전으로 조회 (선택 개수만큼만 비용이 듦)
+        latest_lookup = dataset.latest_lookup
+        selected_display_names = [
+            display_with_rank(latest_lookup[name_refined])
+            for name_refined in st.session_state.selected
+            if name_refined in latest_lookup
+        ]
+        selected_info_text = f"<strong>선택된 단지: {len(st.session_state.selected)}개</strong>"
+        if selected_display_names:
+            selected_info_text += f" - {', '.join(selected_display_names)}"
+        st.markdown(f"<div class='selected-info-bar'>{selected_info_text}</div>", unsafe_allow_html=True)
+
+
+        # 단지 검색 (로딩 시 만든 단지명_정제 인덱스로 부분 문자열 검색)
+        search_col, clear_col = st.columns([6, 1])
+        with search_col:
+            query = st.text_input(
+                "단지 검색", key="selector_query", placeholder="단지명 일부를 입력하세요",
+                label_visibility="collapsed", on_change=change_query,
             )
+        with clear_col:
+            st.button("선택 해제", key="clear_selection", on_click=clear_selection,
+                      disabled=not st.session_state.selected)
+
+        # 단지 선택 버튼 목록
+        st.markdown("<div class='button-container'>", unsafe_allow_html=True)
+
+        # 정렬 기준별 버튼 목록은 로딩 시 미리 만들어 둔 (단지명_정제, 라벨, 키) 튜플을 사용
+        selector_rows = dataset.selector_rows.get(st.session_state.sort_option, dataset.selector_rows["평단가"])
+        matches = dataset.name_index.search(query)
+        if matches is not None:
+            selector_rows = [row for row in selector_rows if row[0] in matches]
+
+        # 현재 페이지의 버튼만 만듦 (단지가 수천 개여도 재실행마다 보내는 위젯 수는 페이지 크기로 고정)
+        page_count = max(1, -(-len(selector_rows) // SELECTOR_PAGE_SIZE))
+        page = min(max(st.session_state.selector_page, 0), page_count - 1)
+        st.session_state.selector_page = page
+        page_rows = selector_rows[page * SELECTOR_PAGE_SIZE:(page + 1) * SELECTOR_PAGE_SIZE]
+
+        # 버튼들을 컬럼으로 감싸서 가로 배열 강제
+        cols_per_row = 8  # 한 줄에 표시할 버튼 수
+
+        with perf.stage('selector_grid', buttons=len(page_rows), matches=len(selector_rows)):
+            if not selector_rows:
+                st.info("검색 결과가 없습니다.")
+            for row_start in range(0, len(page_rows), cols_per_row):
+                cols = st.columns(cols_per_row)
+                for col, (name_refined, button_label, button_key) in zip(cols, page_rows[row_start:row_start + cols_per_row]):
+                    button_type = "primary" if name_refined in st.session_state.selected else "secondary"
+                    with col:
+                        st.button(
+                            button_label, key=button_key, type=button_type,
+                            on_click=toggle_selection, args=(name_refined,),
+                        )
+
+        if page_count > 1:
+            prev_col, info_col, next_col = st.columns([1, 4, 1])
+            with prev_col:
+                st.button("◀ 이전", key="selector_prev", on_click=move_page, args=(-1,), disabled=page == 0)
+            with info_col:
+                first = page * SELECTOR_PAGE_SIZE + 1
+                st.caption(
+                    f"{first:,}–{first + len(page_rows) - 1:,} / {len(selector_rows):,}개 단지 "
+                    f"({page + 1}/{page_count} 페이지)"
+                )
+            with next_col:
+                st.button("다음 ▶", key="selector_next", on_click=move_page, args=(1,),
+                          disabled=page == page_count - 1)
+
+        st.markdown("</div>", unsafe_allow_html=True) # button-container 닫기
+        st.markdown("</div>", unsafe_allow_html=True) # fixed-header 닫기
+
+        # --- 메인 콘텐츠 영역 ---
+        st.markdown("<div class='main-content'>", unsafe_allow_html=True)
+
+        st.markdown("<h1 style='text-align: center; margin-bottom: 20px;'>🏠 네이버 부동산 매물(전용59㎡) 단지별 가격 비교</h1>", unsafe_allow_html=True)
+
+        # 정렬 기준 선택 라디오 버튼
+        st.markdown("#### 정렬 기준 선택")
+        sort_options = list(SORT_OPTIONS)
+        st.radio(
+            "정렬 기준",
+            options=sort_options,
+            horizontal=True,
+            label_visibility="collapsed",
+            key='sort_radio_button',
+            index=sort_options.index(st.session_state.sort_option),
+            on_change=change_sort,
         )
 
-    if has_data:
-        # y축 눈금 2배로
-        y_values = []
-        for _, _, data, _ in traces:
-            y_values.extend(data[subject].tolist())
-        if y_values:
-            tick_count = 10
-            fig.update_yaxes(nticks=tick_count * 2)
-
-        # 평단가 y축 포맷
-        if subject == '평단가':
-            fig.update_yaxes(tickformat=",")
-        elif subject in ['매매가', '전세가', '갭가격']:
-            fig.update_yaxes(tickformat=".1f")
-        elif subject == '하락/상승률':
-            fig.update_yaxes(tickformat=".1f")
-
-        # 세로 길이 60vh (대략 600px)
-        fig.update_layout(
-            xaxis_title="날짜",
-            yaxis_title=f"{subject} {unit_label}",
-            title=f"단지별 {subject} 변화 추이",
-            legend=dict(x=1.02, y=1, bordercolor="Black", borderwidth=1),
-            margin=dict(r=150),
-            hovermode="x unified",
-            height=600  # 60vh 정도
-        )
-        st.plotly_chart(fig, use_container_width=True)
-    else:
-        st.warning(f"선택된 단지에 대한 '{subject}' 데이터가 없습니다.")
-# --- 그래프 출력 ---
-if st.session_state.selected:
-    st.markdown("<div class='graph-container'>", unsafe_allow_html=True)
-    
-    draw_graph(merged_df, "평단가", list(st.session_state.selected), "pyeongdan")
-    draw_graph(merged_df, "매매가", list(st.session_state.selected), "maemega")
-    draw_graph(merged_df, "전세가", list(st.session_state.selected), "jeonsega")
-    draw_graph(merged_df, "갭가격", list(st.session_state.selected), "gapga")
-    draw_graph(merged_df, "하락/상승률", list(st.session_state.selected), "rate")
+        # 시장 중앙값/25~75% 구간 비교선 (로딩 시 만든 집계표를 그대로 사용)
+        st.checkbox("시장 중앙값 함께 보기", key="show_market")
+
+        # 네비게이션 링크
+        st.markdown("### [그래프 바로가기]")
+        st.markdown("""
+        <div class="nav-links">
+            <a href="#pyeongdan">📊 평단가</a>
+            <a href="#maemega">📊 매매가</a>
+            <a href="#jeonsega">📊 전세가</a>
+            <a href="#gapga">📊 갭가격</a>
+            <a href="#rate">📊 하락/상승률</a>
+        </div>
+        """, unsafe_allow_html=True)
+
+        # --- 그래프 출력 ---
+        if st.session_state.selected:
+            st.markdown("<div class='graph-container'>", unsafe_allow_html=True)
+
+            draw_graph(dataset, "평단가", "pyeongdan", default_open=True)
+            draw_graph(dataset, "매매가", "maemega")
+            draw_graph(dataset, "전세가", "jeonsega")
+            draw_graph(dataset, "갭가격", "gapga")
+            draw_graph(dataset, "하락/상승률", "rate")
+
+            st.markdown("</div>", unsafe_allow_html=True)
+        else:
+            st.info("상단 목록에서 그래프에 표시할 단지를 1개 이상 선택해주세요.")
+
+        st.markdown("</div>", unsafe_allow_html=True) # main-content 닫기
 
-    st.markdown("</div>", unsafe_allow_html=True)
-else:
-    st.info("상단 목록에서 그래프에 표시할 단지를 1개 이상 선택해주세요.")
+        # --- 성능 측정 패널 (?debug=1) ---
+        if DEBUG_PANEL:
+            debug_panel(run)
 
-st.markdown("</div>", unsafe_allow_html=True) # main-content 닫기
\ No newline at end of file
+selection_view(dataset)
+perf.finish_run()
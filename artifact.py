@@ -0,0 +1,141 @@
+"""미리 만들어 둔 데이터셋 아티팩트(Arrow IPC) 읽기/쓰기 모듈
+
+ingest.py가 원본별로 정리해 둔 데이터셋을 <root>/<이름>/<버전>/ 아래에 표마다 압축 없는 Arrow IPC 파일
+(<표>.arrow)과 meta.json으로 저장하고, <root>/<이름>/CURRENT에 현재 버전 디렉토리를 적는다.
+앱은 시작할 때 이 파일을 메모리 맵으로 열어 다운로드/파싱/정리 없이 바로 쓴다.
+
+숫자 컬럼은 NaN을 null로 바꾸지 않고 그대로 저장하므로, 읽을 때 복사 없이 파일 페이지를
+그대로 쓴다 (같은 파일을 연 여러 프로세스가 페이지 캐시를 공유).
+"""
+import json
+import logging
+import os
+import shutil
+from datetime import datetime, timezone
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from dataset import assemble_dataset
+
+ARTIFACT_DIR = os.environ.get('BOODONGSAN_ARTIFACT_DIR', './artifacts')
+# 1이면 앱이 시작할 때 아티팩트가 있으면 그것을 사용 (0이면 항상 원본에서 다시 만듦)
+USE_ARTIFACT = os.environ.get('BOODONGSAN_USE_ARTIFACT', '1') != '0'
+# 저장 형식이나 Dataset 구성이 바뀌면 올려서 이전 아티팩트를 무시하게 함
+FORMAT_VERSION = 2
+# 현재 버전 외에 남겨 두는 이전 버전 수 (실행 중인 프로세스가 열어 둔 파일을 바로 지우지 않도록)
+KEEP_VERSIONS = 2
+
+# 원본(sources.py)별 아티팩트 이름
+SHEETS_ARTIFACT = 'sheets'      # app.py (구글 시트 탭별 CSV)
+WORKBOOK_ARTIFACT = 'workbook'  # main.py (드라이브 엑셀 통합문서)
+LOCAL_ARTIFACT = 'local'        # 로컬 스냅샷 파일 디렉토리
+
+logger = logging.getLogger(__name__)
+
+
+def _to_arrow(df):
+    arrays = []
+    for col in df.columns:
+        values = df[col]
+        if pd.api.types.is_float_dtype(values.dtype):
+            # NaN을 값 그대로 두어야 읽을 때 null 처리로 배열을 복사하지 않음
+            arrays.append(pa.array(values.to_numpy()))
+        else:
+            arrays.append(pa.Array.from_pandas(values))
+    return pa.Table.from_arrays(arrays, names=[str(col) for col in df.columns])
+
+
+def _read_table(path):
+    with pa.memory_map(path) as source:
+        table = ipc.open_file(source).read_all()
+    # 컬럼마다 따로 블록을 두어야 숫자 컬럼이 합쳐지며 복사되지 않음
+    return table.to_pandas(split_blocks=True)
+
+
+def write_artifact(name, tables, meta, root=ARTIFACT_DIR):
+    """표 사전 {표 이름: DataFrame}을 새 버전으로 저장하고 CURRENT를 바꾸는 함수 (버전 디렉토리 경로 반환)"""
+    built_at = datetime.now(timezone.utc)
+    version_name = f"{built_at.strftime('%Y%m%dT%H%M%S%f')}-{meta.get('version', 'unversioned')}"
+    base = os.path.join(root, name)
+    final_dir = os.path.join(base, version_name)
+    tmp_dir = f'{final_dir}.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    meta = {
+        **meta,
+        'format_version': FORMAT_VERSION,
+        'name': name,
+        'built_at': built_at.isoformat(timespec='seconds'),
+        'tables': {},
+    }
+    for table_name, df in tables.items():
+        table = _to_arrow(df)
+        with ipc.new_file(os.path.join(tmp_dir, f'{table_name}.arrow'), table.schema) as writer:
+            writer.write_table(table)
+        meta['tables'][table_name] = {'rows': len(df), 'columns': list(table.column_names)}
+    with open(os.path.join(tmp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2, default=str)
+
+    # 디렉토리를 다 쓴 뒤에 이름을 바꾸고 CURRENT를 교체해서, 읽는 쪽은 항상 완성된 버전만 봄
+    os.replace(tmp_dir, final_dir)
+    current_tmp = os.path.join(base, 'CURRENT.tmp')
+    with open(current_tmp, 'w', encoding='utf-8') as f:
+        f.write(version_name)
+    os.replace(current_tmp, os.path.join(base, 'CURRENT'))
+
+    _prune(base, version_name)
+    return final_dir
+
+
+def _prune(base, current):
+    versions = sorted(
+        entry for entry in os.listdir(base)
+        if entry != current and os.path.isdir(os.path.join(base, entry)) and not entry.endswith('.tmp')
+    )
+    for entry in versions[:max(0, len(versions) - KEEP_VERSIONS)]:
+        shutil.rmtree(os.path.join(base, entry), ignore_errors=True)
+
+
+def read_artifact(name, root=ARTIFACT_DIR):
+    """현재 버전의 ({표 이름: DataFrame}, meta)를 돌려주는 함수 (없거나 형식이 다르거나 읽을 수 없으면 None)"""
+    base = os.path.join(root, name)
+    try:
+        with open(os.path.join(base, 'CURRENT'), encoding='utf-8') as f:
+            version_dir = os.path.join(base, f.read().strip())
+        with open(os.path.join(version_dir, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get('format_version') != FORMAT_VERSION:
+        logger.warning("아티팩트 '%s' 형식 버전이 달라 사용하지 않습니다: %s", name, meta.get('format_version'))
+        return None
+
+    try:
+        tables = {
+            table_name: _read_table(os.path.join(version_dir, f'{table_name}.arrow'))
+            for table_name in meta['tables']
+        }
+    except (OSError, pa.ArrowException) as e:
+        logger.warning("아티팩트 '%s' 읽기 실패: %s", name, e)
+        return None
+    return tables, meta
+
+
+def save_dataset_artifact(dataset, meta, root=ARTIFACT_DIR, name=SHEETS_ARTIFACT):
+    """Dataset을 저장 (merged_df와 시장 집계만 저장하고 나머지는 읽을 때 다시 구성)"""
+    meta = {**meta, 'version': dataset.version, 'memory_report': dataset.memory_report}
+    tables = {'merged': dataset.merged_df, 'market': dataset.market.reset_index()}
+    return write_artifact(name, tables, meta, root)
+
+
+def load_dataset_artifact(root=ARTIFACT_DIR, name=SHEETS_ARTIFACT):
+    """저장해 둔 Dataset과 meta를 돌려주는 함수 (없으면 (None, None))"""
+    loaded = read_artifact(name, root)
+    if loaded is None:
+        return None, None
+    tables, meta = loaded
+    market = tables['market'].set_index('날짜')
+    return assemble_dataset(tables['merged'], market, meta['memory_report']), meta
@@ -0,0 +1,201 @@
+"""app.py 단지 선택 클릭 지연 벤치마크 (실제 streamlit 서버에 웹소켓으로 접속)
+
+합성 데이터셋 아티팩트를 임시 디렉토리에 만들고 app.py를 streamlit 서버로 띄운 뒤,
+브라우저처럼 웹소켓으로 단지 버튼 클릭을 보내고 그 클릭의 실행이 끝날 때까지(script_finished)
+걸린 시간과 받은 메시지 양을 잰다. 클릭 후 st.rerun()으로 페이지 전체를 다시 실행하는 이전
+버전과 비교하려면 --baseline-rev로 그 커밋을 지정한다 (아티팩트를 읽는 커밋이어야 함).
+
+    python benchmarks/bench_click_latency.py --complexes 400 --clicks 20
+    python benchmarks/bench_click_latency.py --baseline-rev <이전 커밋>
+
+웹소켓 클라이언트로 websockets 패키지를 사용한다.
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from websockets.sync.client import connect
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.proto.BackMsg_pb2 import BackMsg  # noqa: E402
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg  # noqa: E402
+
+from artifact import save_dataset_artifact  # noqa: E402
+from dataset import prepare_dataset  # noqa: E402
+from sources import GvizSource, convert_date  # noqa: E402
+from synthetic import make_frames  # noqa: E402
+
+DONE = {
+    ForwardMsg.FINISHED_SUCCESSFULLY,
+    ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY,
+    ForwardMsg.FINISHED_WITH_COMPILE_ERROR,
+}
+
+
+def build_artifact(root, complexes):
+    """앱이 찾는 탭 목록(네트워크가 없으면 기본 목록)에 맞춘 합성 아티팩트"""
+    sheets = GvizSource().discover()
+    frames = make_frames(complexes, len(sheets), text=True)
+    for sheet, frame in zip(sheets, frames):
+        frame['날짜'] = convert_date(sheet)
+    save_dataset_artifact(prepare_dataset(frames), {'source': 'synthetic', 'sheets': list(sheets)}, root)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(script, artifact_dir):
+    port = free_port()
+    env = {
+        **os.environ,
+        'BOODONGSAN_ARTIFACT_DIR': artifact_dir,
+        'BOODONGSAN_PERF_LOG': '0',
+    }
+    process = subprocess.Popen(
+        [
+            sys.executable, '-m', 'streamlit', 'run', script,
+            '--server.headless', 'true', '--server.port', str(port),
+            '--server.enableXsrfProtection', 'false', '--browser.gatherUsageStats', 'false',
+        ],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    for _ in range(300):
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/_stcore/health', timeout=1):
+                return process, port
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError('streamlit 서버가 시작되지 않음')
+
+
+class Session:
+    """브라우저 대신 웹소켓으로 스크립트 실행을 요청하는 세션"""
+
+    def __init__(self, ws):
+        self.ws = ws
+        # 버튼 라벨 -> (위젯 id, 프래그먼트 id)
+        self.buttons = {}
+
+    def run(self, widget_states=(), fragment_id=''):
+        """실행 하나를 요청하고 끝날 때까지 받은 (시간, 바이트 수, 실행 횟수)를 돌려줌"""
+        msg = BackMsg()
+        msg.rerun_script.query_string = ''
+        msg.rerun_script.page_script_hash = ''
+        msg.rerun_script.fragment_id = fragment_id
+        for state in widget_states:
+            msg.rerun_script.widget_states.widgets.append(state)
+
+        start = time.perf_counter()
+        self.ws.send(msg.SerializeToString())
+        received = 0
+        runs = 0
+        while True:
+            data = self.ws.recv(timeout=120)
+            received += len(data)
+            forward = ForwardMsg()
+            forward.ParseFromString(data)
+            kind = forward.WhichOneof('type')
+            if kind == 'delta' and forward.delta.WhichOneof('type') == 'new_element':
+                element = forward.delta.new_element
+                # 단지 선택 버튼만 (위젯 id에 키 'btn_<단지명_정제>'가 들어 있음)
+                if element.WhichOneof('type') == 'button' and 'btn_' in element.button.id:
+                    self.buttons[element.button.label] = (element.button.id, forward.delta.fragment_id)
+            elif kind == 'script_finished':
+                runs += 1
+                if forward.script_finished in DONE:
+                    return time.perf_counter() - start, received, runs
+
+    def click(self, label):
+        widget_id, fragment_id = self.buttons[label]
+        msg = BackMsg()
+        state = msg.rerun_script.widget_states.widgets.add()
+        state.id = widget_id
+        state.trigger_value = True
+        return self.run([state], fragment_id)
+
+
+def measure(script, artifact_dir, clicks):
+    process, port = start_server(script, artifact_dir)
+    try:
+        with connect(f'ws://127.0.0.1:{port}/_stcore/stream', max_size=None) as ws:
+            session = Session(ws)
+            first, first_bytes, _ = session.run()
+            labels = list(session.buttons)[:clicks]
+            results = []
+            # 단지를 하나씩 선택했다가 다시 해제 (선택 수가 1~2개로 유지되도록)
+            for label in labels:
+                for _ in range(2):
+                    results.append(session.click(label))
+    finally:
+        process.terminate()
+        process.wait()
+    times = [r[0] * 1000 for r in results]
+    return {
+        'first_ms': first * 1000,
+        'first_kb': first_bytes / 1024,
+        'click_median_ms': statistics.median(times),
+        'click_p90_ms': sorted(times)[int(len(times) * 0.9) - 1],
+        'click_kb': statistics.fmean(r[1] for r in results) / 1024,
+        'runs_per_click': statistics.fmean(r[2] for r in results),
+        'clicks': len(results),
+    }
+
+
+def report(name, result):
+    print(
+        f"[{name}] 첫 화면 {result['first_ms']:.0f} ms ({result['first_kb']:.0f} KB) | "
+        f"클릭 {result['clicks']}회: 중앙값 {result['click_median_ms']:.1f} ms, p90 {result['click_p90_ms']:.1f} ms, "
+        f"클릭당 {result['click_kb']:.1f} KB, 클릭당 스크립트 실행 {result['runs_per_click']:.1f}회"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--complexes', type=int, default=400)
+    parser.add_argument('--clicks', type=int, default=20, help='클릭할 단지 수 (단지마다 선택/해제 2회)')
+    parser.add_argument('--baseline-rev', help='비교할 이전 app.py의 git 커밋')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as artifact_dir:
+        build_artifact(artifact_dir, args.complexes)
+
+        scripts = [('current', 'app.py')]
+        baseline_path = None
+        if args.baseline_rev:
+            source = subprocess.run(
+                ['git', 'show', f'{args.baseline_rev}:app.py'], cwd=ROOT, capture_output=True, check=True,
+            ).stdout
+            # 같은 모듈들을 import하도록 저장소 루트에 임시로 둠
+            baseline_path = os.path.join(ROOT, f'.bench_app_{args.baseline_rev}.py')
+            with open(baseline_path, 'wb') as f:
+                f.write(source)
+            scripts.insert(0, (f'baseline {args.baseline_rev}', baseline_path))
+
+        try:
+            results = {name: measure(script, artifact_dir, args.clicks) for name, script in scripts}
+        finally:
+            if baseline_path:
+                os.remove(baseline_path)
+
+    print(f'complexes={args.complexes}')
+    for name, result in results.items():
+        report(name, result)
+    if len(results) == 2:
+        baseline, current = results.values()
+        print(f"클릭 지연 중앙값: x{baseline['click_median_ms'] / current['click_median_ms']:.1f} 빠름")
+
+
+if __name__ == '__main__':
+    main()
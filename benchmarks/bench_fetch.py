@@ -0,0 +1,83 @@
+"""시트 다운로드 순차/병렬 비교 벤치마크
+
+가짜 지연을 주는 로컬 HTTP 서버를 띄워 네트워크 없이 측정한다.
+
+    python benchmarks/bench_fetch.py --sheets 27 --latency 0.3 --workers 8
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sheet_fetcher import fetch_sheets  # noqa: E402
+
+
+def make_csv(rows):
+    lines = ['단지명,매매가,전세가,전고점,총세대수']
+    for i in range(rows):
+        lines.append(f'단지{i},{10 + i % 7}.5,{6 + i % 5}.2,{12 + i % 6}.0,{500 + i}')
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def start_server(latency, rows):
+    body = make_csv(rows)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/csv; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(sheets, url_for, workers):
+    start = time.perf_counter()
+    results = fetch_sheets(sheets, url_for, max_workers=workers)
+    elapsed = time.perf_counter() - start
+    failed = [r.sheet for r in results if r.error is not None]
+    assert [r.sheet for r in results] == sheets, '결과 순서가 입력 순서와 다름'
+    return elapsed, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sheets', type=int, default=27)
+    parser.add_argument('--latency', type=float, default=0.3, help='요청당 가짜 지연(초)')
+    parser.add_argument('--rows', type=int, default=300, help='시트당 행 수')
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    server = start_server(args.latency, args.rows)
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+    sheets = [f'sheet{i:02d}' for i in range(args.sheets)]
+
+    def url_for(sheet):
+        return f'{base}/{sheet}.csv'
+
+    try:
+        seq, seq_failed = run(sheets, url_for, 1)
+        par, par_failed = run(sheets, url_for, args.workers)
+    finally:
+        server.shutdown()
+
+    print(f'sheets={args.sheets} latency={args.latency}s rows={args.rows}')
+    print(f'sequential (1 worker):  {seq:.2f}s  failed={len(seq_failed)}')
+    print(f'concurrent ({args.workers} workers): {par:.2f}s  failed={len(par_failed)}')
+    print(f'speedup: {seq / par:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
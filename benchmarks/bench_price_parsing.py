@@ -0,0 +1,89 @@
+"""가격 셀 파싱 정확도 확인 및 속도 벤치마크
+
+기존 main.py 방식(문자열 치환 체인)과 price_parsing.parse_prices를 같은 셀에 대해 비교한다.
+
+    python benchmarks/bench_price_parsing.py --cells 1000000
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from price_parsing import parse_prices  # noqa: E402
+
+# (셀 값, 기대값) - 기대값 None은 NaN
+CASES = [
+    ('15.2', 15.2), ('1,234.5', 1234.5), (' 7.25 ', 7.25), ('-1.5', -1.5),
+    ('-', None), ('', None), (None, None), (np.nan, None), ('nan', None), ('매물없음', None),
+    ('15억', 15.0), ('15억 2,000', 15.2), ('15억2000만', 15.2), ('8,500만', 0.85),
+    ('3.5억', 3.5), ('-2억 500', -2.05), ('12억원', 12.0), (12, 12.0), (9.75, 9.75),
+]
+
+
+def check_cases():
+    values = pd.Series([value for value, _ in CASES], dtype=object)
+    parsed = parse_prices(values)
+    failures = []
+    for (value, expected), got in zip(CASES, parsed):
+        ok = math.isnan(got) if expected is None else abs(got - expected) < 1e-9
+        if not ok:
+            failures.append((value, expected, got))
+    for value, expected, got in failures:
+        print(f'FAIL {value!r}: expected {expected}, got {got}')
+    print(f'correctness: {len(CASES) - len(failures)}/{len(CASES)} cases ok')
+    return not failures
+
+
+def legacy_parse(values):
+    # 기존 main.py 방식 (억/만 표기는 처리하지 못하고 음수 부호도 지워짐)
+    return values.astype(str).str.replace(",", "").str.replace("-", "").replace("", None).astype(float)
+
+
+def make_cells(n, with_units, seed=0):
+    rng = np.random.default_rng(seed)
+    price = rng.uniform(1, 40, n).round(2)
+    cells = pd.Series([f'{p:,.2f}' for p in price], dtype=object)
+    cells[rng.random(n) < 0.05] = '-'
+    cells[rng.random(n) < 0.02] = ''
+    if with_units:
+        unit_rows = rng.random(n) < 0.1
+        cells[unit_rows] = [f'{int(p)}억 {int((p % 1) * 10000):,}' for p in price[unit_rows]]
+    return cells
+
+
+def best_of(func, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cells', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    ok = check_cases()
+
+    plain = make_cells(args.cells, with_units=False)
+    mixed = make_cells(args.cells, with_units=True)
+    legacy = best_of(lambda: legacy_parse(plain))
+    shared = best_of(lambda: parse_prices(plain))
+    shared_mixed = best_of(lambda: parse_prices(mixed))
+    print(f'cells={args.cells:,}')
+    print(f'legacy chain (plain cells):        {legacy:.3f}s')
+    print(f'parse_prices (plain cells):        {shared:.3f}s')
+    print(f'parse_prices (10% 억/만 표기 셀):  {shared_mixed:.3f}s')
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""단지별 시계열 조회: 전체 표 스캔 vs SeriesIndex 비교 벤치마크
+
+    python benchmarks/bench_series_index.py --complexes 500 --snapshots 100 --selected 20
+"""
+import argparse
+import os
+import sys
+import time
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataset import METRIC_COLUMNS, prepare_dataset  # noqa: E402
+from synthetic import make_frames  # noqa: E402
+
+
+def scan_lookup(df, selected):
+    # 기존 방식: 지표(그래프) 5개 x 선택 단지마다 전체 표를 불리언 스캔
+    for subject in METRIC_COLUMNS:
+        for name in selected:
+            data = df[df['단지명_정제'] == name].copy()
+            data.dropna(subset=['날짜', subject], inplace=True)
+
+
+def index_lookup(series_index, selected):
+    for subject in METRIC_COLUMNS:
+        for name in selected:
+            data = series_index.get(name)
+            data = data[data['날짜'].notna() & data[subject].notna()]
+
+
+def best_of(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--complexes', type=int, default=500)
+    parser.add_argument('--snapshots', type=int, default=100)
+    parser.add_argument('--selected', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    frames = make_frames(args.complexes, args.snapshots)
+    start = time.perf_counter()
+    dataset = prepare_dataset(frames)
+    build = time.perf_counter() - start
+
+    selected = list(dataset.series_index.offsets)[:args.selected]
+    scan = best_of(lambda: scan_lookup(dataset.merged_df, selected), args.repeat)
+    index = best_of(lambda: index_lookup(dataset.series_index, selected), args.repeat)
+
+    print(f'rows={len(dataset.merged_df):,} complexes={args.complexes} snapshots={args.snapshots} selected={len(selected)}')
+    print(f'prepare_dataset (index 포함): {build * 1000:.1f} ms')
+    print(f'scan  lookup x5 charts: {scan * 1000:.1f} ms')
+    print(f'index lookup x5 charts: {index * 1000:.1f} ms')
+    print(f'speedup: {scan / index:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
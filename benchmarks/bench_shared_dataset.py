@@ -0,0 +1,80 @@
+"""세션별 데이터셋 복사(cache_data) vs 읽기 전용 공유(cache_resource) 비교 벤치마크
+
+st.cache_data는 저장된 피클을 접근할 때마다 역직렬화해서 넘겨주고, 공유 모드는 같은 객체를
+얕은 복사 뷰로 감싸서 넘겨준다. 동시에 접속한 세션 수만큼 데이터셋을 들고 있을 때의
+추가 메모리와 세션당 데이터셋 획득 시간을 잰다.
+
+    python benchmarks/bench_shared_dataset.py --sessions 50 --complexes 500 --snapshots 100
+"""
+import argparse
+import os
+import pickle
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataset import enable_copy_on_write, freeze_dataset, prepare_dataset, session_view  # noqa: E402
+from synthetic import make_frames  # noqa: E402
+
+
+def simulate(sessions, acquire):
+    """세션 수만큼 동시에 데이터셋을 받아 모두 받을 때까지 들고 있게 하고 (추가 메모리, 지연 목록)을 돌려줌"""
+    barrier = threading.Barrier(sessions)
+    held = [None] * sessions
+    latencies = [0.0] * sessions
+
+    def session(i):
+        barrier.wait()
+        start = time.perf_counter()
+        held[i] = acquire()
+        latencies[i] = time.perf_counter() - start
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        list(pool.map(session, range(sessions)))
+    extra = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    # 다음 측정 전에 들고 있던 데이터셋을 놓음
+    held.clear()
+    return extra, latencies
+
+
+def report(label, sessions, extra, latencies):
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(
+        f'{label:<8} sessions={sessions} 추가 메모리 {extra / 1e6:8.2f} MB '
+        f'(세션당 {extra / sessions / 1e6:6.2f} MB)  '
+        f'획득 지연 평균 {statistics.mean(latencies) * 1000:7.2f} ms / p95 {p95 * 1000:7.2f} ms'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=50)
+    parser.add_argument('--complexes', type=int, default=500)
+    parser.add_argument('--snapshots', type=int, default=100)
+    args = parser.parse_args()
+
+    dataset = prepare_dataset(make_frames(args.complexes, args.snapshots))
+    # cache_data가 보관하는 형태: 피클 바이트
+    blob = pickle.dumps(dataset, protocol=pickle.HIGHEST_PROTOCOL)
+    # app.py가 공유 모드로 시작할 때와 같은 설정 (pandas 2.x)
+    enable_copy_on_write()
+    shared = freeze_dataset(dataset)
+
+    print(f'rows={len(dataset.merged_df):,} pickle={len(blob) / 1e6:.2f} MB')
+    extra, latencies = simulate(args.sessions, lambda: pickle.loads(blob))
+    report('copied', args.sessions, extra, latencies)
+    extra, latencies = simulate(args.sessions, lambda: session_view(shared))
+    report('shared', args.sessions, extra, latencies)
+
+
+if __name__ == '__main__':
+    main()
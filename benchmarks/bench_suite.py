@@ -0,0 +1,200 @@
+"""대시보드 주요 단계 벤치마크 모음 (결과는 JSON 파일로 저장해 실행 간 비교)
+
+합성 스냅샷(synthetic.py)으로 다음 단계를 잰다.
+- transform: load_data()의 변환 단계 (prepare_dataset, 전체 / 새 날짜 하나만 추가)
+  새 날짜 하나만 추가하는 쪽이 전체보다 느리거나 결과가 다르면 종료 코드 1
+- selector: 단지 선택 버튼 목록, 헤더용 최신 값 사전, 이름 검색 인덱스 준비와 검색
+- figure: draw_graph()의 그래프 생성 (일반 / 대량 선택 / 시장 비교선)
+- dash: main.py 서버 콜백(update_graph)의 그래프 생성과 clientside용 데이터 준비
+
+    python benchmarks/bench_suite.py --complexes 500 --snapshots 100
+    python benchmarks/bench_suite.py --compare benchmarks/results/bench-20250101T000000Z.json
+
+--compare로 이전 결과를 주면 중앙값 기준으로 비교하고, --threshold 배 이상 느려진 항목이 있으면
+종료 코드 1을 돌려준다.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+import plotly
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from charts import LARGE_SELECTION_THRESHOLD, build_figure, payload_size  # noqa: E402
+from dash_app import build_price_figure, build_store_payload  # noqa: E402
+from dataset import NameIndex, build_latest_lookup, build_selector_rows, prepare_dataset  # noqa: E402
+from synthetic import make_df_all, make_frames  # noqa: E402
+
+# 한 글자부터 한 단어까지 타이핑하는 순서대로의 검색어
+SEARCH_QUERIES = ['1', '12', '단지 1', '단지 12', '단지 012', '없는 단지']
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+def measure(func, repeat):
+    """한 번 미리 실행한 뒤 repeat번 잰 시간(ms) 통계"""
+    func()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return {
+        'median_ms': round(statistics.median(times), 3),
+        'min_ms': round(min(times), 3),
+        'mean_ms': round(statistics.fmean(times), 3),
+        'repeat': repeat,
+    }
+
+
+def build_cases(args):
+    """(이름, 함수) 목록"""
+    frames = make_frames(args.complexes, args.snapshots, text=True)
+    dataset = prepare_dataset(frames)
+    previous = prepare_dataset(frames[:-1])
+    names = list(dataset.series_index.offsets)
+    small = names[:args.selected]
+    large = names[:max(LARGE_SELECTION_THRESHOLD, args.selected * 5)]
+
+    df_all = make_df_all(args.dash_complexes, args.dash_snapshots)
+    dash_names = sorted(df_all['단지명'].unique())[:args.selected]
+
+    return [
+        ('transform.full', lambda: prepare_dataset(frames)),
+        ('transform.one_new_snapshot', lambda: prepare_dataset(frames, previous.market, previous.merged_df)),
+        ('selector.rows', lambda: build_selector_rows(dataset.latest_df)),
+        ('selector.latest_lookup', lambda: build_latest_lookup(dataset.latest_df)),
+        ('selector.name_index', lambda: NameIndex(dataset.latest_lookup)),
+        ('selector.search', lambda: [dataset.name_index.search(q) for q in SEARCH_QUERIES]),
+        ('figure.small', lambda: build_figure(dataset.series_index, '평단가', small)),
+        ('figure.small_payload', lambda: payload_size(build_figure(dataset.series_index, '평단가', small))),
+        ('figure.large', lambda: build_figure(dataset.series_index, '평단가', large)),
+        ('figure.small_with_market', lambda: build_figure(dataset.series_index, '평단가', small, dataset.market)),
+        ('dash.update_graph', lambda: build_price_figure(df_all, dash_names, '매매가')),
+        ('dash.store_payload', lambda: build_store_payload(df_all)),
+    ]
+
+
+def check_incremental(args, results):
+    """새 날짜 하나만 추가한 데이터셋이 전체를 다시 만든 것과 같고 더 빠른지 확인 (문제 목록 반환)"""
+    problems = []
+    frames = make_frames(args.complexes, args.snapshots, text=True)
+    full = prepare_dataset(frames)
+    previous = prepare_dataset(frames[:-1])
+    incremental = prepare_dataset(frames, previous.market, previous.merged_df)
+
+    def ordered(df):
+        return df.sort_values(['날짜', '단지명_정제'], kind='stable', ignore_index=True).astype({
+            col: object for col in ['단지명', '단지명_정제']
+        })
+
+    if not ordered(full.merged_df).equals(ordered(incremental.merged_df)):
+        problems.append('새 날짜만 추가한 merged_df(백분위 포함)가 전체를 다시 만든 것과 다름')
+    if full.version != incremental.version:
+        problems.append('새 날짜만 추가한 데이터셋의 version이 전체를 다시 만든 것과 다름')
+
+    one_new, full_result = results.get('transform.one_new_snapshot'), results.get('transform.full')
+    if one_new and full_result and one_new['median_ms'] >= full_result['median_ms']:
+        problems.append(
+            f"새 날짜 하나 추가({one_new['median_ms']:.1f} ms)가 전체({full_result['median_ms']:.1f} ms)보다 빠르지 않음"
+        )
+    return problems
+
+
+def git_commit():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def compare(previous, current, threshold):
+    """이전 결과와 중앙값을 비교해 출력하고 느려진 항목 이름 목록을 돌려줌"""
+    regressions = []
+    for name, result in current['results'].items():
+        old = previous['results'].get(name)
+        if old is None:
+            print(f'  {name:<28} (이전 결과 없음)')
+            continue
+        ratio = result['median_ms'] / old['median_ms'] if old['median_ms'] else float('inf')
+        flag = ''
+        if ratio >= threshold:
+            flag = '  <- 느려짐'
+            regressions.append(name)
+        print(f"  {name:<28} {old['median_ms']:>10.2f} -> {result['median_ms']:>10.2f} ms  x{ratio:.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--complexes', type=int, default=500)
+    parser.add_argument('--snapshots', type=int, default=100)
+    parser.add_argument('--selected', type=int, default=10)
+    parser.add_argument('--dash-complexes', type=int, default=300)
+    parser.add_argument('--dash-snapshots', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--only', default='', help='이 문자열로 시작하는 항목만 실행 (예: figure)')
+    parser.add_argument('--output', help='결과 JSON 경로 (기본값: benchmarks/results/bench-<시각>.json)')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON')
+    parser.add_argument('--threshold', type=float, default=1.2)
+    args = parser.parse_args()
+
+    started = datetime.now(timezone.utc)
+    report = {
+        'meta': {
+            'started_at': started.isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'plotly': plotly.__version__,
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'params': {
+                key: getattr(args, key)
+                for key in ['complexes', 'snapshots', 'selected', 'dash_complexes', 'dash_snapshots', 'repeat']
+            },
+        },
+        'results': {},
+    }
+
+    for name, func in build_cases(args):
+        if not name.startswith(args.only):
+            continue
+        result = measure(func, args.repeat)
+        report['results'][name] = result
+        print(f"{name:<28} median {result['median_ms']:>10.2f} ms  min {result['min_ms']:>10.2f} ms")
+
+    problems = []
+    if any(name.startswith('transform') for name in report['results']):
+        problems = check_incremental(args, report['results'])
+        for problem in problems:
+            print(f'확인 실패: {problem}')
+
+    output = args.output or os.path.join(RESULTS_DIR, f"bench-{started.strftime('%Y%m%dT%H%M%SZ')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f'결과 저장: {output}')
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            previous = json.load(f)
+        print(f"비교 대상: {args.compare} (commit {previous['meta'].get('commit')})")
+        regressions = compare(previous, report, args.threshold)
+        if regressions:
+            print(f"{args.threshold}배 이상 느려진 항목: {', '.join(regressions)}")
+            sys.exit(1)
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,220 @@
+"""http_cache 조건부 요청/응답 캐시 점검 스크립트 (로컬 대역 서버 사용)
+
+ETag와 Last-Modified를 주고 조건부 요청에 304로 답하는 로컬 HTTP 서버를 띄워, 네트워크 없이
+다음을 확인하고 받은 바이트 수를 출력한다. 하나라도 어긋나면 종료 코드 1을 돌려준다.
+
+- 처음 받을 때는 200과 본문 전체, 검증자를 디스크 캐시에 저장
+- 다시 받을 때 If-None-Match/If-Modified-Since를 보내고 304면 캐시 본문을 돌려줌
+- 원본이 바뀌면 200으로 새 본문을 받고 캐시를 교체
+- 검증자가 없는 응답은 캐시하지 않고 조건부 요청도 보내지 않음
+- 캐시 본문이 없는데 304가 오면 조건 없이 다시 받고, 그래도 304면 빈 본문 대신 HTTPError
+- gzip 압축 응답을 풀어서 돌려줌
+- 한 세션의 연결 풀을 재사용
+- sheet_fetcher.fetch_sheets가 같은 경로로 304를 받음
+
+    python benchmarks/check_http_cache.py --rows 3000
+"""
+import argparse
+import gzip
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import http_cache  # noqa: E402
+from http_cache import ResponseCache, fetch  # noqa: E402
+from sheet_fetcher import fetch_sheets  # noqa: E402
+from synthetic import complex_names  # noqa: E402
+
+
+class StandInServer:
+    """경로별 본문과 검증자 방식을 정해 두고, 받은 요청 헤더와 보낸 바이트 수를 기록하는 서버"""
+
+    def __init__(self):
+        # 경로 -> (본문, 검증자 방식 'etag' | 'last_modified' | 'none')
+        # 'stray_304'는 no-cache 요청이 아니면 무조건 304, 'always_304'는 항상 304
+        self.resources = {}
+        self.requests = []
+        self.sent = 0
+        self.client_ports = set()
+        self._lock = threading.Lock()
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                body, validator = owner.resources[self.path.split('?')[0]]
+                etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+                # 본문 해시로 만든 가짜 수정 시각 (본문이 바뀌면 시각도 바뀜)
+                last_modified = formatdate(1_700_000_000 + int(etag[1:9], 16) % 10_000_000, usegmt=True)
+                with owner._lock:
+                    owner.requests.append((self.path, dict(self.headers)))
+                    owner.client_ports.add(self.client_address[1])
+
+                not_modified = (
+                    (validator == 'etag' and self.headers.get('If-None-Match') == etag)
+                    or (validator == 'last_modified' and self.headers.get('If-Modified-Since') == last_modified)
+                    or (validator == 'stray_304' and 'no-cache' not in self.headers.get('Cache-Control', ''))
+                    or validator == 'always_304'
+                )
+                if not_modified:
+                    self.send_response(304)
+                    payload = b''
+                else:
+                    self.send_response(200)
+                    payload = body
+                    if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                        payload = gzip.compress(body)
+                        self.send_header('Content-Encoding', 'gzip')
+                    self.send_header('Content-Type', 'text/csv; charset=utf-8')
+                if validator == 'etag':
+                    self.send_header('ETag', etag)
+                elif validator == 'last_modified':
+                    self.send_header('Last-Modified', last_modified)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                with owner._lock:
+                    owner.sent += len(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base = f'http://127.0.0.1:{self.server.server_address[1]}'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def last_headers(self):
+        return self.requests[-1][1]
+
+    def take_sent(self):
+        with self._lock:
+            sent, self.sent = self.sent, 0
+        return sent
+
+
+def make_csv(rows, seed=0):
+    lines = ['단지명,매매가,전세가,전고점,총세대수']
+    for i, name in enumerate(complex_names(rows)):
+        lines.append(f'{name},{10 + (i + seed) % 7}.5,{6 + i % 5}.2,{12 + i % 6}.0,{500 + i}')
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def check(name, condition, detail=''):
+    print(f"  [{'OK' if condition else 'FAIL'}] {name}{f' ({detail})' if detail else ''}")
+    return condition
+
+
+def run_checks(rows):
+    server = StandInServer()
+    body = make_csv(rows)
+    server.resources = {'/etag.csv': (body, 'etag'), '/lm.csv': (body, 'last_modified'), '/plain.csv': (body, 'none')}
+    results = []
+
+    with tempfile.TemporaryDirectory() as root:
+        cache = ResponseCache(root)
+        url = f'{server.base}/etag.csv'
+
+        first = fetch(url, cache=cache)
+        first_sent = server.take_sent()
+        results.append(check('ETag: 첫 요청 200', first.status == 200 and first.content == body))
+        results.append(check('ETag: 첫 요청은 조건부 헤더 없음', 'If-None-Match' not in server.last_headers()))
+        results.append(check('ETag: 검증자를 캐시에 저장', cache.load(url) is not None))
+        results.append(check(
+            'gzip 응답을 풀어서 돌려줌', first_sent < len(body),
+            f'원문 {len(body) / 1024:,.1f} KB, 전송 {first_sent / 1024:,.1f} KB',
+        ))
+
+        second = fetch(url, cache=cache)
+        second_sent = server.take_sent()
+        results.append(check(
+            'ETag: 두 번째 요청에 If-None-Match', server.last_headers().get('If-None-Match') == first.etag,
+        ))
+        results.append(check(
+            'ETag: 바뀌지 않았으면 304와 캐시 본문', second.not_modified and second.content == body,
+            f'전송 {second_sent} B',
+        ))
+
+        changed = make_csv(rows, seed=1)
+        server.resources['/etag.csv'] = (changed, 'etag')
+        third = fetch(url, cache=cache)
+        results.append(check('ETag: 바뀌면 200과 새 본문', not third.not_modified and third.content == changed))
+        results.append(check('ETag: 캐시도 새 본문으로 교체', cache.load(url)[1] == changed))
+
+        url = f'{server.base}/lm.csv'
+        fetch(url, cache=cache)
+        again = fetch(url, cache=cache)
+        results.append(check(
+            'Last-Modified: If-Modified-Since를 보내고 304',
+            'If-Modified-Since' in server.last_headers() and again.not_modified and again.content == body,
+        ))
+
+        url = f'{server.base}/plain.csv'
+        fetch(url, cache=cache)
+        plain = fetch(url, cache=cache)
+        headers = server.last_headers()
+        results.append(check(
+            '검증자가 없으면 캐시하지 않음',
+            cache.load(url) is None and not plain.not_modified
+            and 'If-None-Match' not in headers and 'If-Modified-Since' not in headers,
+        ))
+
+        server.resources['/stray.csv'] = (body, 'stray_304')
+        stray = fetch(f'{server.base}/stray.csv', cache=cache)
+        results.append(check(
+            '캐시 본문 없이 304가 오면 조건 없이 다시 받음',
+            stray.status == 200 and stray.content == body
+            and server.last_headers().get('Cache-Control') == 'no-cache',
+        ))
+        server.resources['/always.csv'] = (body, 'always_304')
+        try:
+            fetch(f'{server.base}/always.csv', cache=cache)
+            raised = False
+        except requests.HTTPError:
+            raised = True
+        results.append(check('다시 받아도 304면 빈 본문 대신 HTTPError', raised))
+
+        # sheet_fetcher도 같은 조건부 요청 경로를 씀 (기본 캐시를 임시 디렉토리로 바꿔서 확인)
+        http_cache._default_cache = ResponseCache(os.path.join(root, 'default'))
+        sheets = [f'sheet{i:02d}' for i in range(8)]
+        for sheet in sheets:
+            server.resources[f'/{sheet}.csv'] = (make_csv(rows, seed=len(sheet)), 'etag')
+        server.take_sent()
+        cold = fetch_sheets(sheets, lambda sheet: f'{server.base}/{sheet}.csv')
+        cold_sent = server.take_sent()
+        warm = fetch_sheets(sheets, lambda sheet: f'{server.base}/{sheet}.csv')
+        warm_sent = server.take_sent()
+        results.append(check(
+            'fetch_sheets: 두 번째는 모두 304',
+            all(r.error is None for r in cold + warm) and all(r.not_modified for r in warm)
+            and all(len(a.df) == len(b.df) == rows for a, b in zip(cold, warm)),
+            f'전송 {cold_sent / 1024:,.1f} KB -> {warm_sent / 1024:,.1f} KB',
+        ))
+
+    results.append(check(
+        '연결 풀 재사용', len(server.client_ports) < len(server.requests),
+        f'요청 {len(server.requests)}개, 연결 {len(server.client_ports)}개',
+    ))
+    server.server.shutdown()
+    return all(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=3000, help='가짜 시트의 행 수')
+    args = parser.parse_args()
+    print(f'rows={args.rows}')
+    if not run_checks(args.rows):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""공유 데이터셋(freeze_dataset/session_view) 격리 점검 스크립트
+
+한 세션이 session_view()로 받은 표를 고쳐도 오류 없이 그 세션에만 반영되고,
+공유 원본(다른 세션이 보는 표)은 그대로인지 확인한다. 하나라도 어긋나면 종료 코드 1을 돌려준다.
+pandas 2.x(copy-on-write가 기본이 아님)와 3.x 양쪽에서 돌려 본다. 2.x에서는 copy-on-write를
+켜기 전(세션마다 깊은 복사)과 app.py처럼 enable_copy_on_write()로 켠 뒤(배열 공유)를 모두 확인한다.
+
+    python benchmarks/check_shared_dataset.py
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataset import copy_on_write_enabled, enable_copy_on_write, freeze_dataset, prepare_dataset, session_view  # noqa: E402
+from synthetic import make_frames  # noqa: E402
+
+
+def check(name, condition, detail=''):
+    print(f"  [{'OK' if condition else 'FAIL'}] {name}{f' ({detail})' if detail else ''}")
+    return condition
+
+
+def session_write(name, shared, label, write):
+    """세션 뷰의 표(label)에 write를 적용하고, 오류가 없고 공유 표가 그대로인지 확인"""
+    shared_df = getattr(shared, label)
+    before = shared_df.copy(deep=True)
+    try:
+        write(getattr(session_view(shared), label))
+    except Exception as e:
+        return check(name, False, f'{type(e).__name__}: {e}')
+    return check(name, shared_df.equals(before) and list(shared_df.columns) == list(before.columns))
+
+
+def scale(df):
+    df['매매가'] *= 2
+
+
+def assign(df):
+    df.loc[df.index[0], '평단가'] = -1.0
+
+
+def add_column(df):
+    df['세션_컬럼'] = 1
+
+
+def fill(df):
+    df['전세가'] = df['전세가'].fillna(0)
+
+
+def run_checks():
+    cow = copy_on_write_enabled()
+    print(f"copy-on-write {'on' if cow else 'off'}")
+    shared = freeze_dataset(prepare_dataset(make_frames(50, 5)))
+    first = shared.merged_df.index[0]
+    results = []
+
+    view = session_view(shared)
+    view.merged_df.loc[first, '매매가'] = 12345.0
+    results.append(check(
+        'session_view merged_df .loc 대입이 공유 표에 반영되지 않음',
+        shared.merged_df.loc[first, '매매가'] != 12345.0,
+    ))
+
+    for label in ['merged_df', 'latest_df']:
+        results.append(session_write(f'{label}: 컬럼 *= (제자리 연산)', shared, label, scale))
+        results.append(session_write(f'{label}: .loc 대입', shared, label, assign))
+        results.append(session_write(f'{label}: 컬럼 추가', shared, label, add_column))
+        results.append(session_write(f'{label}: 컬럼 교체', shared, label, fill))
+
+    shares = np.shares_memory(
+        session_view(shared).merged_df['매매가'].to_numpy(), shared.merged_df['매매가'].to_numpy(),
+    )
+    if not cow:
+        results.append(check('copy-on-write가 꺼져 있으면 세션마다 복사본', not shares))
+        return results
+
+    # 공유 표 자체의 배열은 직접 고칠 수 없어야 함
+    try:
+        shared.merged_df['매매가'].to_numpy()[0] = 1.0
+        written = True
+    except ValueError:
+        written = False
+    results.append(check('공유 표 배열에 직접 쓰기는 막힘', not written))
+    results.append(check('공유 표 배열은 복사 없이 세션과 같은 메모리', shares))
+    return results
+
+
+def main():
+    print(f'pandas {pd.__version__}')
+    results = []
+    if not copy_on_write_enabled():
+        results += run_checks()
+    # app.py가 공유 모드로 시작할 때와 같은 설정
+    enable_copy_on_write()
+    results += run_checks()
+    if not all(results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
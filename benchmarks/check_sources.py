@@ -0,0 +1,259 @@
+"""데이터 원본(sources.py)과 load_dataset() 점검 스크립트 (로컬 대역 서버 사용)
+
+구글 시트 htmlview/gviz CSV를 흉내 내는 로컬 HTTP 서버를 띄워, 네트워크 없이 다음을 확인한다.
+하나라도 어긋나면 종료 코드 1을 돌려준다.
+
+- 날짜(yy.mm.dd)가 아닌 탭('2024', 'Jan 2025', '메모' 등)은 discover에서 걸러서 요청하지 않음
+- 첫 load_dataset()은 오류 없이 날짜 탭을 모두 불러와 아티팩트를 만듦
+- 같은 탭으로 다시 부르면 시트를 받거나 읽지 않고 아티팩트를 그대로 씀
+- 엑셀 통합문서(로컬 파일): 파일이 그대로면 읽지 않고 아티팩트를 씀, 바뀌면 다시 만듦
+- 엑셀 통합문서(드라이브 대역): 다시 시작할 때 HEAD 요청만 보내고 본문은 받지 않음,
+  서버에 닿지 못하면 경고를 남기고 마지막 아티팩트로 시작
+
+    python benchmarks/check_sources.py
+"""
+import hashlib
+import os
+import socket
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# 단계별 시간 로그는 점검 결과와 섞이지 않게 끔
+os.environ.setdefault('BOODONGSAN_PERF_LOG', '0')
+
+import http_cache  # noqa: E402
+import sources  # noqa: E402
+from ingest import load_dataset  # noqa: E402
+from snapshot_store import SnapshotStore  # noqa: E402
+from synthetic import complex_names, make_snapshots  # noqa: E402
+
+DATE_TABS = ['25.10.12', '25.11.08', '25.11.23']
+# 날짜처럼 보이지만 yy.mm.dd가 아닌 탭과 날짜가 아닌 탭
+OTHER_TABS = ['2024', 'Jan 2025', '메모', '25.13.01']
+
+
+class StandInSheet:
+    """htmlview(탭 목록)와 탭별 gviz CSV를 돌려주고, 받은 CSV 요청 탭을 기록하는 서버"""
+
+    def __init__(self, tabs, rows=30):
+        self.tabs = tabs
+        self.rows = rows
+        self.csv_requests = []
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path.endswith('/htmlview'):
+                    body = ''.join(
+                        f'items.push({{name: "{tab}", pageUrl: "#", gid: "{i}"}});'
+                        for i, tab in enumerate(owner.tabs)
+                    ).encode('utf-8')
+                else:
+                    sheet = parse_qs(url.query)['sheet'][0]
+                    owner.csv_requests.append(sheet)
+                    body = owner.csv(sheet)
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base = f'http://127.0.0.1:{self.server.server_address[1]}'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def csv(self, sheet):
+        lines = ['단지명,매매가,전세가,전고점,총세대수']
+        for i, name in enumerate(complex_names(self.rows)):
+            lines.append(f'{name},{10 + (i + len(sheet)) % 7}.5,{6 + i % 5}.2,{12 + i % 6}.0,{500 + i}')
+        return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+class StandInDrive:
+    """통합문서 하나를 ETag와 함께 돌려주고 (GET/HEAD) 받은 요청 방식을 기록하는 서버"""
+
+    def __init__(self, content):
+        self.content = content
+        self.methods = []
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def respond(self, body):
+                owner.methods.append(self.command)
+                etag = '"' + hashlib.sha256(owner.content).hexdigest()[:16] + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', str(len(owner.content)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(owner.content)
+
+            def do_GET(self):
+                self.respond(True)
+
+            def do_HEAD(self):
+                self.respond(False)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/uc?export=download'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+
+def workbook_bytes(complexes=30, snapshots=4, seed=0):
+    """시트 이름이 날짜인 합성 통합문서 (셀은 구글 시트처럼 문자열)"""
+    buffer = BytesIO()
+    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+        for date, frame in make_snapshots(complexes, snapshots, seed=seed, text=True):
+            frame.to_excel(writer, sheet_name=date.strftime('%Y-%m-%d'), index=False)
+    return buffer.getvalue()
+
+
+def check(name, condition, detail=''):
+    print(f"  [{'OK' if condition else 'FAIL'}] {name}{f' ({detail})' if detail else ''}")
+    return condition
+
+
+def check_gviz(root):
+    server = StandInSheet(OTHER_TABS[:2] + DATE_TABS[:1] + OTHER_TABS[2:] + DATE_TABS[1:])
+    sources.sheet_htmlview_url = lambda sheet_id: f'{server.base}/{sheet_id}/htmlview'
+    sources.gviz_csv_url = lambda sheet_id, sheet: f'{server.base}/{sheet_id}/gviz?sheet={sheet}'
+    results = []
+
+    source = sources.GvizSource('check', SnapshotStore(os.path.join(root, 'store')))
+    names = source.discover()
+    results.append(check('날짜 탭만 날짜순으로 찾음', names == tuple(DATE_TABS), ', '.join(names)))
+
+    artifacts = os.path.join(root, 'artifacts')
+    problems = []
+    dataset, missing = load_dataset(source, warn=problems.append, error=problems.append, root=artifacts)
+    results.append(check(
+        '첫 로딩: 오류 없이 날짜 탭을 모두 불러옴',
+        not problems and not missing and dataset.merged_df['날짜'].nunique() == len(DATE_TABS)
+        and sorted(server.csv_requests) == sorted(DATE_TABS),
+        '; '.join(problems),
+    ))
+
+    server.csv_requests.clear()
+    problems = []
+    again = sources.GvizSource('check', SnapshotStore(os.path.join(root, 'store')))
+    loaded = []
+    load = again.load
+    again.load = lambda names, error: loaded.append(list(names)) or load(names, error)
+    dataset_again, missing = load_dataset(again, warn=problems.append, error=problems.append, root=artifacts)
+    results.append(check(
+        '다시 로딩: 시트를 받거나 읽지 않고 아티팩트를 씀',
+        not problems and not missing and not loaded and not server.csv_requests
+        and dataset_again.version == dataset.version,
+        '; '.join(problems),
+    ))
+    server.server.shutdown()
+    return results
+
+
+def check_workbook_file(root):
+    path = os.path.join(root, 'workbook.xlsx')
+    with open(path, 'wb') as f:
+        f.write(workbook_bytes())
+    artifacts = os.path.join(root, 'workbook_file')
+    results = []
+
+    first, _ = load_dataset(sources.WorkbookSource(path), root=artifacts)
+    restart = sources.WorkbookSource(path)
+    problems = []
+    dataset, _ = load_dataset(restart, warn=problems.append, root=artifacts)
+    results.append(check(
+        '파일이 그대로면 읽지 않고 아티팩트를 씀',
+        restart.content is None and not problems and dataset.version == first.version,
+    ))
+
+    with open(path, 'wb') as f:
+        f.write(workbook_bytes(seed=1))
+    changed = sources.WorkbookSource(path)
+    dataset, _ = load_dataset(changed, root=artifacts)
+    results.append(check(
+        '파일이 바뀌면 다시 읽어서 만듦', changed.content is not None and dataset.version != first.version,
+    ))
+    return results
+
+
+def check_workbook_drive(root):
+    drive = StandInDrive(workbook_bytes())
+    artifacts = os.path.join(root, 'workbook_drive')
+    results = []
+
+    first, _ = load_dataset(sources.WorkbookSource(None, drive.url), root=artifacts)
+    results.append(check('첫 시작: 통합문서를 받아서 만듦', drive.methods == ['GET'] and len(first.merged_df) > 0))
+
+    drive.methods.clear()
+    restart = sources.WorkbookSource(None, drive.url)
+    problems = []
+    dataset, _ = load_dataset(restart, warn=problems.append, root=artifacts)
+    results.append(check(
+        '다시 시작: HEAD 요청만 보내고 아티팩트를 씀',
+        drive.methods == ['HEAD'] and restart.content is None and not problems
+        and dataset.version == first.version,
+        ', '.join(drive.methods),
+    ))
+
+    drive.methods.clear()
+    drive.content = workbook_bytes(seed=1)
+    changed = sources.WorkbookSource(None, drive.url)
+    dataset, _ = load_dataset(changed, root=artifacts)
+    results.append(check(
+        '통합문서가 바뀌면 받아서 다시 만듦',
+        drive.methods == ['HEAD', 'GET'] and dataset.version != first.version,
+        ', '.join(drive.methods),
+    ))
+
+    drive.server.shutdown()
+    # 아무도 듣지 않는 포트 (열어 둔 연결 풀을 거치지 않도록 주소를 바꿈)
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        closed_port = s.getsockname()[1]
+    problems = []
+    offline = sources.WorkbookSource(None, f'http://127.0.0.1:{closed_port}/uc?export=download')
+    dataset, _ = load_dataset(offline, warn=problems.append, root=artifacts)
+    results.append(check(
+        '서버에 닿지 못하면 경고를 남기고 마지막 아티팩트로 시작',
+        len(dataset.merged_df) > 0 and any('아티팩트를 사용' in problem for problem in problems),
+        f'경고 {len(problems)}건',
+    ))
+    return results
+
+
+def main():
+    with tempfile.TemporaryDirectory() as root:
+        http_cache._default_cache = http_cache.ResponseCache(os.path.join(root, 'http_cache'))
+        print('GvizSource')
+        results = check_gviz(root)
+        print('WorkbookSource (로컬 파일)')
+        results += check_workbook_file(root)
+        print('WorkbookSource (드라이브)')
+        results += check_workbook_drive(root)
+    if not all(results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
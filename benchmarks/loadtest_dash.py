@@ -0,0 +1,221 @@
+"""Dash 그래프 갱신 부하 테스트: 서버 콜백 모드 vs clientside 모드
+
+합성 데이터로 앱을 모드별로 별도 프로세스에서 띄우고, 두 모드에 같은 동시 부하를 준다.
+
+- 페이지 로딩: 클라이언트마다 페이지(/, /_dash-layout, /_dash-dependencies)를 반복해서 받음.
+  서버 모드는 첫 그래프도 서버 콜백으로 받으므로 update_graph 요청 1회를 더 보냄.
+  clientside 모드의 레이아웃에는 dcc.Store 데이터가 들어 있어 페이지가 더 큼.
+- 세션: 페이지를 받은 뒤 단지/가격 종류를 --interactions번 바꿈. 상호작용마다 서버 쪽에 남아 있는
+  그래프 콜백(_dash-dependencies로 확인)만 요청하므로 clientside 모드에서는 요청이 없음.
+
+모드마다 초당 처리량(페이지, 세션, 상호작용, 서버 요청), 서버 CPU(페이지당, 상호작용당),
+클라이언트당 첫 로딩 바이트를 나란히 출력한다. 두 모드에서 같은 dash 정적 JS 번들은 세지 않는다.
+서버 CPU는 리눅스 /proc으로 잰다.
+
+    python benchmarks/loadtest_dash.py --complexes 300 --snapshots 30 --clients 8 --duration 10
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import threading
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dash_app import PRICE_TYPES, create_app  # noqa: E402
+from synthetic import make_df_all  # noqa: E402
+
+
+def serve(df_all, clientside, port):
+    import logging
+
+    from werkzeug.serving import make_server
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    app = create_app(df_all, clientside=clientside)
+    make_server('127.0.0.1', port, app.server, threaded=True).serve_forever()
+
+
+def cpu_seconds(pid):
+    """리눅스 /proc 기준 프로세스 누적 CPU 시간(초), 확인할 수 없으면 None"""
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def start(df_all, clientside, port):
+    ctx = multiprocessing.get_context('fork')
+    process = ctx.Process(target=serve, args=(df_all, clientside, port), daemon=True)
+    process.start()
+    base = f'http://127.0.0.1:{port}'
+    for _ in range(200):
+        try:
+            if requests.get(f'{base}/_dash-layout', timeout=1).ok:
+                return process, base
+        except requests.RequestException:
+            time.sleep(0.1)
+    raise RuntimeError('서버가 시작되지 않음')
+
+
+def update_payload(names, rng):
+    selected = rng.sample(names, k=rng.randint(1, 5))
+    price_type = rng.choice(PRICE_TYPES)
+    return {
+        'output': 'price-graph.figure',
+        'outputs': {'id': 'price-graph', 'property': 'figure'},
+        'inputs': [
+            {'id': 'apt-selector', 'property': 'value', 'value': selected},
+            {'id': 'price-type', 'property': 'value', 'value': price_type},
+        ],
+        'changedPropIds': ['apt-selector.value'],
+        'state': [],
+    }
+
+
+def server_graph_callback(base):
+    """그래프 콜백이 서버에서 실행되는지 (_dash-dependencies에서 clientside_function이 없으면 서버)"""
+    dependencies = requests.get(f'{base}/_dash-dependencies').json()
+    for dependency in dependencies:
+        if 'price-graph.figure' in dependency['output']:
+            return dependency.get('clientside_function') is None
+    return False
+
+
+def hammer(base, names, clients, duration, interactions, server_graph):
+    """클라이언트마다 (페이지 로딩 + 상호작용 interactions번)을 반복
+
+    interactions가 0이면 페이지 로딩만 반복한다. 끝까지 마친 세션만 센다.
+    """
+    totals = [{'pages': 0, 'sessions': 0, 'interactions': 0, 'requests': 0, 'bytes': 0, 'failed': 0}
+              for _ in range(clients)]
+    deadline = time.perf_counter() + duration
+
+    def client(i):
+        rng = random.Random(i)
+        session = requests.Session()
+        total = totals[i]
+
+        def call(method, path, **kwargs):
+            response = session.request(method, f'{base}{path}', **kwargs)
+            total['requests'] += 1
+            total['bytes'] += len(response.content)
+            if not response.ok:
+                total['failed'] += 1
+            return response.ok
+
+        def update_graph():
+            return call('POST', '/_dash-update-component', json=update_payload(names, rng))
+
+        while time.perf_counter() < deadline:
+            # 페이지 로딩 (서버 모드는 첫 그래프도 서버에서 받음)
+            ok = call('GET', '/') and call('GET', '/_dash-layout') and call('GET', '/_dash-dependencies')
+            ok = ok and (not server_graph or update_graph())
+            if not ok:
+                continue
+            total['pages'] += 1
+            for _ in range(interactions):
+                if time.perf_counter() >= deadline:
+                    return
+                # clientside면 브라우저에서 그리므로 서버 요청 없음
+                if server_graph and not update_graph():
+                    break
+                total['interactions'] += 1
+            else:
+                total['sessions'] += 1
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {key: sum(total[key] for total in totals) for key in totals[0]}
+
+
+def measure(df_all, names, clientside, port, args):
+    """모드 하나를 띄워 페이지 로딩 부하와 세션 부하를 차례로 주고 결과 사전을 돌려줌"""
+    process, base = start(df_all, clientside, port)
+    try:
+        server_graph = server_graph_callback(base)
+        results = {'server_graph': server_graph}
+        for phase, interactions in [('page', 0), ('session', args.interactions)]:
+            cpu_before = cpu_seconds(process.pid)
+            counts = hammer(base, names, args.clients, args.duration, interactions, server_graph)
+            cpu_after = cpu_seconds(process.pid)
+            counts['cpu_s'] = cpu_after - cpu_before if cpu_before is not None else None
+            results[phase] = counts
+    finally:
+        process.terminate()
+        process.join()
+    return results
+
+
+def rate(count, duration):
+    return f'{count / duration:8.1f}/s'
+
+
+def per(cpu_s, count):
+    if cpu_s is None or not count:
+        return '     n/a'
+    return f'{cpu_s / count * 1000:6.2f}ms'
+
+
+def report(label, results, args):
+    page, session = results['page'], results['session']
+    page_kb = page['bytes'] / page['pages'] / 1e3 if page['pages'] else float('nan')
+    print(
+        f"[{label:<10}] 페이지 로딩: {rate(page['pages'], args.duration)} "
+        f"서버 요청 {rate(page['requests'], args.duration)} (실패 {page['failed']}) | "
+        f"클라이언트당 첫 로딩 {page_kb:8.1f} KB | 페이지당 서버 CPU {per(page['cpu_s'], page['pages'])}"
+    )
+    print(
+        f"[{label:<10}] 세션(페이지 + 상호작용 {args.interactions}번): {rate(session['sessions'], args.duration)} "
+        f"상호작용 {rate(session['interactions'], args.duration)} "
+        f"서버 요청 {rate(session['requests'], args.duration)} (실패 {session['failed']}) | "
+        f"상호작용당 서버 CPU {per(session['cpu_s'], session['interactions'])} "
+        f"(페이지 로딩 포함), 상호작용당 서버 요청 {session['requests'] / max(session['interactions'], 1):.2f}회"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--complexes', type=int, default=300)
+    parser.add_argument('--snapshots', type=int, default=30)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--interactions', type=int, default=20, help='세션 하나에서 단지/가격 종류를 바꾸는 횟수')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    df_all = make_df_all(args.complexes, args.snapshots)
+    names = sorted(df_all['단지명'].unique())
+    print(
+        f'rows={len(df_all):,} complexes={args.complexes} snapshots={args.snapshots} '
+        f'clients={args.clients} duration={args.duration}s interactions={args.interactions}'
+    )
+
+    measured = {}
+    for label, clientside, port in [('server', False, args.port), ('clientside', True, args.port + 1)]:
+        results = measure(df_all, names, clientside, port, args)
+        print(f"[{label:<10}] 그래프 콜백 실행 위치: {'서버' if results['server_graph'] else '브라우저'}")
+        report(label, results, args)
+        measured[label] = results
+
+    def page_kb(results):
+        return results['page']['bytes'] / max(results['page']['pages'], 1) / 1e3
+
+    server, clientside = measured['server']['session'], measured['clientside']['session']
+    print(
+        f"clientside / server: 상호작용 처리량 x{clientside['interactions'] / max(server['interactions'], 1):.1f}, "
+        f"첫 로딩 +{page_kb(measured['clientside']) - page_kb(measured['server']):.1f} KB/클라이언트"
+    )
+
+
+if __name__ == '__main__':
+    main()
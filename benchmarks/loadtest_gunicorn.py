@@ -0,0 +1,204 @@
+"""main.py Dash 앱 gunicorn 운영 서버 부하 테스트: 워커 수별 처리량과 메모리
+
+합성 엑셀 통합문서와 그 데이터셋 아티팩트를 임시 디렉토리에 만들고, gunicorn.conf.py로
+main:server를 워커 수별로 띄워 여러 클라이언트가 동시에 요청을 보낸다. 워커 수마다
+초당 처리량, 지연 시간, 프로세스별 RSS와 PSS(공유 페이지를 나눠 센 실제 사용량)를 출력한다.
+--preload both이면 preload_app을 켠 경우와 끈 경우를 함께 잰다.
+
+    python benchmarks/loadtest_gunicorn.py --workers 1,2,4 --clients 16 --duration 10
+    python benchmarks/loadtest_gunicorn.py --mode layout --preload both
+
+--mode callback은 서버 콜백 모드(BOODONGSAN_DASH_CLIENTSIDE=0)의 그래프 갱신 요청을,
+--mode layout은 clientside 모드의 첫 화면 요청(/_dash-layout, 데이터 포함)을 보낸다.
+리눅스 /proc을 읽으므로 리눅스에서만 메모리를 잴 수 있다. gunicorn 패키지가 필요하다.
+"""
+import argparse
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from io import BytesIO
+
+import pandas as pd
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ingest import ingest  # noqa: E402
+from loadtest_dash import update_payload  # noqa: E402
+from sources import WorkbookSource  # noqa: E402
+from synthetic import complex_names, make_snapshots  # noqa: E402
+
+
+def build_workbook(path, complexes, snapshots):
+    """시트 이름이 날짜인 합성 통합문서 (셀은 구글 시트처럼 문자열)"""
+    buffer = BytesIO()
+    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+        for date, frame in make_snapshots(complexes, snapshots, text=True):
+            frame.to_excel(writer, sheet_name=date.strftime('%Y-%m-%d'), index=False)
+    with open(path, 'wb') as f:
+        f.write(buffer.getvalue())
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def children(pid):
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as f:
+            return [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+
+
+def memory_kb(pid):
+    """(RSS, PSS) KB (읽을 수 없으면 None)"""
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            fields = dict(line.split(':', 1) for line in f if ':' in line and not line.startswith(('0', '7')))
+        return int(fields['Rss'].split()[0]), int(fields['Pss'].split()[0])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def start_server(workers, preload, mode, env_base):
+    port = free_port()
+    env = {
+        **env_base,
+        'BOODONGSAN_GUNICORN_BIND': f'127.0.0.1:{port}',
+        'BOODONGSAN_GUNICORN_WORKERS': str(workers),
+        'BOODONGSAN_GUNICORN_PRELOAD': '1' if preload else '0',
+        'BOODONGSAN_DASH_CLIENTSIDE': '1' if mode == 'layout' else '0',
+    }
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'main:server'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base = f'http://127.0.0.1:{port}'
+    started = time.perf_counter()
+    for _ in range(600):
+        if process.poll() is not None:
+            raise RuntimeError('gunicorn이 종료됨 (gunicorn 설치 여부를 확인)')
+        try:
+            if len(children(process.pid)) >= workers and requests.get(f'{base}/_dash-layout', timeout=2).ok:
+                return process, base, time.perf_counter() - started
+        except requests.RequestException:
+            pass
+        time.sleep(0.1)
+    process.kill()
+    raise RuntimeError('gunicorn이 시작되지 않음')
+
+
+def hammer(base, mode, names, clients, duration):
+    """(완료 요청 수, 실패 수, 지연 시간 목록 ms)"""
+    latencies = [[] for _ in range(clients)]
+    errors = [0] * clients
+    deadline = time.perf_counter() + duration
+
+    def client(i):
+        rng = random.Random(i)
+        session = requests.Session()
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            if mode == 'layout':
+                response = session.get(f'{base}/_dash-layout')
+            else:
+                response = session.post(f'{base}/_dash-update-component', json=update_payload(names, rng))
+            if response.ok:
+                latencies[i].append((time.perf_counter() - start) * 1000)
+            else:
+                errors[i] += 1
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    flat = [latency for items in latencies for latency in items]
+    return len(flat), sum(errors), flat
+
+
+def measure(workers, preload, args, env_base, names):
+    process, base, startup = start_server(workers, preload, args.mode, env_base)
+    try:
+        done, failed, latencies = hammer(base, args.mode, names, args.clients, args.duration)
+        # 부하를 준 뒤의 메모리 (워커가 요청을 처리하며 복사한 페이지까지 포함)
+        master = memory_kb(process.pid)
+        worker_memory = [memory_kb(pid) for pid in children(process.pid)]
+    finally:
+        process.terminate()
+        process.wait()
+    worker_memory = [m for m in worker_memory if m is not None]
+    return {
+        'workers': workers,
+        'preload': preload,
+        'startup_s': startup,
+        'rps': done / args.duration,
+        'failed': failed,
+        'p50_ms': statistics.median(latencies) if latencies else float('nan'),
+        'p90_ms': sorted(latencies)[int(len(latencies) * 0.9) - 1] if latencies else float('nan'),
+        'master_rss_mb': master[0] / 1024 if master else float('nan'),
+        'worker_rss_mb': statistics.fmean(m[0] for m in worker_memory) / 1024 if worker_memory else float('nan'),
+        'worker_pss_mb': statistics.fmean(m[1] for m in worker_memory) / 1024 if worker_memory else float('nan'),
+        'total_pss_mb': (sum(m[1] for m in worker_memory) + (master[1] if master else 0)) / 1024,
+    }
+
+
+def report(result):
+    print(
+        f"workers={result['workers']:<2} preload={'on ' if result['preload'] else 'off'} | "
+        f"시작 {result['startup_s']:5.1f}s | {result['rps']:7.1f} req/s (실패 {result['failed']}) "
+        f"p50 {result['p50_ms']:6.1f} ms p90 {result['p90_ms']:6.1f} ms | "
+        f"마스터 RSS {result['master_rss_mb']:6.1f} MB, 워커당 RSS {result['worker_rss_mb']:6.1f} MB "
+        f"PSS {result['worker_pss_mb']:6.1f} MB, 전체 PSS {result['total_pss_mb']:7.1f} MB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--complexes', type=int, default=300)
+    parser.add_argument('--snapshots', type=int, default=30)
+    parser.add_argument('--workers', default='1,2,4', help='쉼표로 구분한 워커 수 목록')
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--mode', choices=['callback', 'layout'], default='callback')
+    parser.add_argument('--preload', choices=['on', 'off', 'both'], default='on')
+    args = parser.parse_args()
+
+    worker_counts = [int(count) for count in args.workers.split(',')]
+    preloads = {'on': [True], 'off': [False], 'both': [True, False]}[args.preload]
+    names = complex_names(args.complexes)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        xlsx_path = os.path.join(tmp, 'workbook.xlsx')
+        artifact_dir = os.path.join(tmp, 'artifacts')
+        build_workbook(xlsx_path, args.complexes, args.snapshots)
+        # 운영 배포처럼 아티팩트를 미리 만들어 두고 서버는 그것을 메모리 맵으로 읽음
+        ingest(WorkbookSource(xlsx_path), artifact_dir)
+        env_base = {
+            **os.environ,
+            'BOODONGSAN_XLSX_PATH': xlsx_path,
+            'BOODONGSAN_ARTIFACT_DIR': artifact_dir,
+            'BOODONGSAN_PERF_LOG': '0',
+        }
+
+        print(
+            f'mode={args.mode} complexes={args.complexes} snapshots={args.snapshots} '
+            f'clients={args.clients} duration={args.duration}s cpu={os.cpu_count()}'
+        )
+        for preload in preloads:
+            for workers in worker_counts:
+                report(measure(workers, preload, args, env_base, names))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""벤치마크용 합성 스냅샷 데이터 생성기
+
+실제 시트와 같은 컬럼(단지명, 매매가, 전세가, 전고점, 총세대수)의 날짜별 표를 만든다.
+가격은 단지마다 날짜를 따라 조금씩 움직이고, 날짜마다 일부 단지는 매물이 없어 빠진다.
+text=True이면 구글 시트 CSV처럼 천 단위 구분자, '-' 자리표시, 억/만 표기가 섞인 문자열로 만든다.
+
+    from synthetic import make_frames, make_df_all
+    frames = make_frames(complexes=500, snapshots=100)   # 원본(sources.py) load() 결과 모양
+    df_all = make_df_all(complexes=300, snapshots=30)    # main.py df_all (Dataset.merged_df) 모양
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataset import prepare_dataset  # noqa: E402
+
+SHEET_COLUMNS = ['단지명', '매매가', '전세가', '전고점', '총세대수']
+
+
+def complex_names(complexes):
+    # 일부 이름은 띄어쓰기가 달라 단지명_정제에서 하나로 합쳐지는 경우를 흉내 냄
+    return [f'단지 {i:04d}' if i % 10 else f'단지{i:04d}' for i in range(complexes)]
+
+
+def _as_text(values, rng, unit_ratio):
+    """억 단위 실수 배열을 시트 셀 문자열로 바꿈 (일부는 '15억 2,000' 표기, NaN은 '-')"""
+    text = np.array([f'{v:,.2f}' for v in values], dtype=object)
+    with_unit = rng.random(len(values)) < unit_ratio
+    for i in np.flatnonzero(with_unit & ~np.isnan(values)):
+        eok, man = divmod(round(values[i] * 10000), 10000)
+        text[i] = f'{eok}억 {man:,}' if man else f'{eok}억'
+    text[np.isnan(values)] = '-'
+    return text
+
+
+def make_snapshots(complexes, snapshots, seed=0, text=False, missing_ratio=0.05, unit_ratio=0.02):
+    """[(날짜, 시트 표)] 목록을 만드는 함수 (시트 표에는 날짜 컬럼이 없음)"""
+    rng = np.random.default_rng(seed)
+    names = np.array(complex_names(complexes), dtype=object)
+    households = rng.integers(100, 5000, complexes)
+    price = rng.uniform(5, 25, complexes)
+    jeonse_ratio = rng.uniform(0.4, 0.7, complexes)
+    peak = price * rng.uniform(1.0, 1.4, complexes)
+
+    result = []
+    for date in pd.date_range('2024-05-22', periods=snapshots, freq='7D'):
+        # 날짜마다 단지별 가격이 -2% ~ +2% 범위에서 움직임
+        price = price * rng.uniform(0.98, 1.02, complexes)
+        peak = np.maximum(peak, price)
+        jeonse = price * np.clip(jeonse_ratio + rng.normal(0, 0.01, complexes), 0.2, 0.95)
+        present = rng.random(complexes) >= missing_ratio
+        sale = price.round(2)
+        rent = jeonse.round(2)
+        # 매물은 있어도 전세가 비어 있는 행
+        rent[rng.random(complexes) < missing_ratio / 2] = np.nan
+
+        if text:
+            frame = pd.DataFrame({
+                '단지명': names,
+                '매매가': _as_text(sale, rng, unit_ratio),
+                '전세가': _as_text(rent, rng, unit_ratio),
+                '전고점': _as_text(peak.round(2), rng, unit_ratio),
+                '총세대수': [f'{h:,}' for h in households],
+            })
+        else:
+            frame = pd.DataFrame({
+                '단지명': names,
+                '매매가': sale,
+                '전세가': rent,
+                '전고점': peak.round(2),
+                '총세대수': households,
+            })
+        result.append((date, frame[present].reset_index(drop=True)))
+    return result
+
+
+def make_frames(complexes, snapshots, seed=0, text=False):
+    """원본(sources.py) load()가 prepare_dataset()에 넘기는 모양 (날짜 컬럼이 붙은 시트 표 목록)"""
+    frames = []
+    for date, frame in make_snapshots(complexes, snapshots, seed=seed, text=text):
+        frame['날짜'] = date
+        frames.append(frame)
+    return frames
+
+
+def make_df_all(complexes, snapshots, seed=0):
+    """main.py df_all 모양 (prepare_dataset()으로 정리한 Dataset.merged_df)
+
+    문자열 셀을 실제 정리 파이프라인(dataset.prepare_dataset)에 그대로 통과시킨다.
+    """
+    return prepare_dataset(make_frames(complexes, snapshots, seed=seed, text=True)).merged_df
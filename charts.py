@@ -0,0 +1,202 @@
+"""지표별 Plotly 그래프를 만들고 재사용하는 모듈"""
+import threading
+from collections import OrderedDict
+
+import plotly.graph_objects as go
+
+from dataset import restore_precision
+
+# 선택 단지가 이 수 이상이면 WebGL(Scattergl) + 압축 데이터 모드로 그림
+LARGE_SELECTION_THRESHOLD = 30
+
+
+def unit_label_for(subject):
+    if subject in ['매매가', '전세가', '갭가격']:
+        return "(억)"
+    elif subject == '평단가':
+        return "(만원)"
+    elif subject == '하락/상승률':
+        return "(%)"
+    return ""
+
+
+def _add_market_traces(fig, market, subject, large):
+    """시장 중앙값(점선)과 25~75% 구간(음영)을 비교용 trace로 추가"""
+    columns = [f"{subject}_p25", f"{subject}_p50", f"{subject}_p75"]
+    if market is None or not set(columns) <= set(market.columns):
+        return
+    band = market[columns].dropna()
+    if band.empty:
+        return
+
+    if large:
+        trace_type = go.Scattergl
+        x = band.index.to_numpy(dtype='datetime64[ms]').astype('int64')
+    else:
+        trace_type = go.Scatter
+        x = band.index
+    p25, p50, p75 = (restore_precision(band[col]).to_numpy() for col in columns)
+
+    common = dict(x=x, mode='lines', legendgroup='market', hoverinfo='skip')
+    fig.add_trace(trace_type(y=p25, line=dict(width=0), showlegend=False, **common))
+    fig.add_trace(trace_type(
+        y=p75, line=dict(width=0), fill='tonexty', fillcolor='rgba(128,128,128,0.15)',
+        name='시장 25~75%', **common
+    ))
+    fig.add_trace(trace_type(
+        y=p50, line=dict(color='gray', dash='dash', width=2), name='시장 중앙값', **common
+    ))
+
+
+def build_figure(series_index, subject, selected, market=None):
+    """선택한 단지들의 subject 변화 그래프를 만드는 함수 (그릴 데이터가 없으면 None)
+
+    market에 시장 집계표(Dataset.market)를 넘기면 시장 중앙값과 25~75% 구간을 함께 그린다.
+    """
+    unit_label = unit_label_for(subject)
+
+    # 기준 날짜(마지막 날짜)에서의 y값이 큰 순서로 정렬
+    traces = []
+    for name_refined in selected:
+        # 로딩 시 만들어 둔 인덱스에서 날짜순 블록을 바로 꺼냄 (전체 표 스캔 없음)
+        data = series_index.get(name_refined)
+        if data is not None and subject in data.columns:
+            data = data[data['날짜'].notna() & data[subject].notna()]
+            if not data.empty:
+                display_name = data['단지명'].iloc[0]
+                # 기준 날짜: x축에서 가장 마지막 값
+                last_y = data[subject].iloc[-1]
+                traces.append((last_y, name_refined, data, display_name))
+
+    if not traces:
+        return None
+
+    # 기준 날짜의 y값이 큰 순서로 정렬
+    traces.sort(reverse=True, key=lambda x: x[0])
+
+    large = len(traces) >= LARGE_SELECTION_THRESHOLD
+    y_format = "%{y:.1f}" if subject == '평단가' else "%{y}"
+    fig = go.Figure()
+    if large:
+        # 모든 trace가 같은 hovertemplate를 그래프 템플릿에서 물려받도록 해서 문자열을 한 번만 보냄
+        fig.layout.template.data.scattergl = [go.Scattergl(
+            hovertemplate=(
+                f"단지명: %{{fullData.name}}<br>날짜: %{{x|%Y-%m-%d}}<br>{subject}: {y_format}{unit_label}<extra></extra>"
+            )
+        )]
+        fig.update_xaxes(type='date')
+
+    # 시장 비교 trace는 단지 trace 아래(먼저)에 그림
+    _add_market_traces(fig, market, subject, large)
+
+    for _, name_refined, data, display_name in traces:
+        if large:
+            fig.add_trace(
+                go.Scattergl(
+                    # 날짜는 epoch 밀리초 정수 배열로 보냄 (점마다 날짜 문자열을 보내지 않음)
+                    x=data['날짜'].to_numpy(dtype='datetime64[ms]').astype('int64'),
+                    y=restore_precision(data[subject]).to_numpy(),
+                    mode='lines+markers',
+                    name=display_name,
+                    marker=dict(size=4),
+                )
+            )
+            continue
+
+        hovertemplate = (
+            f"단지명: {display_name}<br>날짜: %{{x}}<br>{subject}: {y_format}{unit_label}<extra></extra>"
+        )
+        fig.add_trace(
+            go.Scatter(
+                x=data['날짜'],
+                y=restore_precision(data[subject]),
+                mode='lines+markers',
+                name=display_name,
+                marker=dict(size=8),
+                hovertemplate=hovertemplate
+            )
+        )
+
+    # y축 눈금 2배로
+    tick_count = 10
+    fig.update_yaxes(nticks=tick_count * 2)
+
+    # 평단가 y축 포맷
+    if subject == '평단가':
+        fig.update_yaxes(tickformat=",")
+    elif subject in ['매매가', '전세가', '갭가격']:
+        fig.update_yaxes(tickformat=".1f")
+    elif subject == '하락/상승률':
+        fig.update_yaxes(tickformat=".1f")
+
+    # 세로 길이 60vh (대략 600px)
+    fig.update_layout(
+        xaxis_title="날짜",
+        yaxis_title=f"{subject} {unit_label}",
+        title=f"단지별 {subject} 변화 추이",
+        legend=dict(x=1.02, y=1, bordercolor="Black", borderwidth=1),
+        margin=dict(r=150),
+        # 단지가 많으면 통합 툴팁이 화면을 덮으므로 가까운 점만 표시
+        hovermode="closest" if large else "x unified",
+        height=600  # 60vh 정도
+    )
+    return fig
+
+
+def payload_size(fig):
+    """그래프를 브라우저로 보낼 때의 JSON 크기(바이트)"""
+    return len(fig.to_json().encode('utf-8'))
+
+
+class FigureCache:
+    """(선택 단지 집합, 지표, 데이터 버전) 키로 만든 그래프를 보관하는 LRU 캐시
+
+    캐시된 그래프는 여러 세션이 함께 쓰므로 꺼낸 뒤 수정하지 않는다.
+    """
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(selected, subject, data_version, with_market=False):
+        return frozenset(selected), subject, data_version, with_market
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+
+        # 그래프 생성은 락 밖에서 수행 (동시에 같은 키를 만들면 나중 결과로 덮어씀)
+        value = build()
+        with self._lock:
+            self.misses += 1
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+def cached_figure(cache, series_index, subject, selected, data_version, market=None):
+    """선택 순서와 관계없이 같은 조합이면 캐시된 (그래프, 전송 크기)를 돌려주는 함수
+
+    그릴 데이터가 없으면 (None, 0). 시장 집계표는 데이터 버전에 묶여 있으므로 키에는 사용 여부만 넣는다.
+    """
+    key = FigureCache.make_key(selected, subject, data_version, market is not None)
+
+    def build():
+        # 집합 순서에 따라 동점 단지의 범례 순서가 바뀌지 않도록 이름순으로 고정
+        fig = build_figure(series_index, subject, sorted(key[0]), market)
+        return (fig, payload_size(fig)) if fig is not None else (None, 0)
+
+    return cache.get_or_build(key, build)
@@ -0,0 +1,159 @@
+"""단지별 가격 변화 Dash 앱 구성 (main.py에서 사용)
+
+CLIENTSIDE 모드에서는 정리된 데이터를 dcc.Store로 브라우저에 한 번만 보내고,
+단지/가격 종류를 바꿀 때의 필터링과 그래프 구성은 브라우저(clientside callback)에서 한다.
+이 경우 선택을 바꿔도 서버로 요청이 가지 않는다.
+"""
+import os
+
+import dash
+import pandas as pd
+import plotly.express as px
+import plotly.io as pio
+from dash import dcc, html, Input, Output, State
+
+# 그래프로 고를 수 있는 지표 (원본에 값이 없는 지표는 선택지에서 뺌, available_price_types 참고)
+PRICE_TYPES = ["매매가", "전세가", "갭가격", "평단가", "하락/상승률"]
+
+# 1이면 브라우저에서 그래프를 그림 (0이면 기존처럼 선택마다 서버 콜백 호출)
+CLIENTSIDE = os.environ.get('BOODONGSAN_DASH_CLIENTSIDE', '1') != '0'
+
+# 브라우저에서 px.line과 같은 모양의 그래프를 만드는 함수
+_CLIENTSIDE_UPDATE_GRAPH = """
+function(selectedApts, priceType, store) {
+    const layout = {
+        template: store.template,
+        legend: {title: {text: "단지명"}, tracegroupgap: 0},
+        xaxis: {title: {text: "날짜"}},
+        yaxis: {title: {text: priceType}},
+        margin: {t: 60},
+    };
+    if (!selectedApts || selectedApts.length === 0) {
+        layout.title = {text: "단지를 선택해주세요."};
+        return {data: [], layout: layout};
+    }
+    layout.title = {text: priceType + " 변화 추이"};
+    const data = [];
+    for (const name of selectedApts) {
+        const series = store.series[name];
+        if (!series) {
+            continue;
+        }
+        data.push({
+            type: "scatter",
+            mode: "lines+markers",
+            name: name,
+            legendgroup: name,
+            showlegend: true,
+            x: series.x.map(function(i) { return store.dates[i]; }),
+            y: series[priceType],
+            hovertemplate: "단지명=" + name + "<br>날짜=%{x}<br>" + priceType + "=%{y}<extra></extra>",
+        });
+    }
+    return {data: data, layout: layout};
+}
+"""
+
+
+def available_price_types(df_all):
+    """df_all에 값이 하나라도 있는 지표 (엑셀 통합문서에 전고점이 없으면 하락/상승률은 빠짐)"""
+    return [
+        price_type for price_type in PRICE_TYPES
+        if price_type in df_all.columns and df_all[price_type].notna().any()
+    ]
+
+
+def build_store_payload(df_all):
+    """브라우저로 보낼 압축된 데이터: 날짜 목록 + 단지별 (날짜 번호, 가격 배열)"""
+    ordered = df_all.sort_values("날짜", kind="stable")
+    dates = sorted(ordered["날짜"].unique())
+    date_index = {date: i for i, date in enumerate(dates)}
+
+    price_types = available_price_types(df_all)
+    series = {}
+    for name, group in ordered.groupby("단지명", sort=True, observed=True):
+        entry = {"x": [date_index[date] for date in group["날짜"]]}
+        for price_type in price_types:
+            values = group[price_type].astype("float64").round(4)
+            # NaN은 JSON null (그래프에서 끊긴 구간)
+            entry[price_type] = [None if pd.isna(v) else float(v) for v in values]
+        series[name] = entry
+
+    return {
+        "dates": [pd.Timestamp(date).strftime("%Y-%m-%d") for date in dates],
+        "series": series,
+        # 서버의 px.line과 같은 기본 템플릿
+        "template": pio.templates[pio.templates.default].to_plotly_json(),
+    }
+
+
+def build_price_figure(df_all, selected_apts, price_type):
+    """서버 콜백 모드에서 선택한 단지들의 가격 그래프를 만드는 함수"""
+    if not selected_apts:
+        return px.line(title="단지를 선택해주세요.")
+
+    filtered = df_all[df_all["단지명"].isin(selected_apts)]
+    fig = px.line(
+        filtered,
+        x="날짜",
+        y=price_type,
+        color="단지명",
+        markers=True,
+        title=f"{price_type} 변화 추이"
+    )
+    fig.update_layout(legend_title_text="단지명", xaxis_title="날짜", yaxis_title=price_type)
+    return fig
+
+
+def create_app(df_all, clientside=CLIENTSIDE):
+    """정리된 df_all로 Dash 앱을 만드는 함수"""
+    app = dash.Dash(__name__)
+    단지목록 = sorted(df_all["단지명"].unique())
+    price_types = available_price_types(df_all)
+
+    app.layout = html.Div([
+        html.H2("단지별 가격 변화 추이"),
+
+        html.Div([
+            html.Label("단지 선택:"),
+            dcc.Dropdown(
+                options=[{"label": name, "value": name} for name in 단지목록],
+                value=단지목록[:1],
+                multi=True,
+                id="apt-selector"
+            ),
+        ], style={"margin": "10px"}),
+
+        html.Div([
+            html.Label("가격 종류 선택:"),
+            dcc.RadioItems(
+                options=[{"label": price_type, "value": price_type} for price_type in price_types],
+                value="매매가",
+                inline=True,
+                id="price-type"
+            ),
+        ], style={"margin": "10px"}),
+
+        dcc.Graph(id="price-graph"),
+        # clientside 모드에서만 데이터를 페이지와 함께 한 번 보냄
+        dcc.Store(id="price-data", data=build_store_payload(df_all) if clientside else None),
+    ])
+
+    if clientside:
+        app.clientside_callback(
+            _CLIENTSIDE_UPDATE_GRAPH,
+            Output("price-graph", "figure"),
+            Input("apt-selector", "value"),
+            Input("price-type", "value"),
+            State("price-data", "data"),
+        )
+    else:
+        @app.callback(
+            Output("price-graph", "figure"),
+            Input("apt-selector", "value"),
+            Input("price-type", "value"),
+        )
+        def update_graph(selected_apts, price_type):
+            return build_price_figure(df_all, selected_apts, price_type)
+
+    return app
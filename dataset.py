@@ -0,0 +1,461 @@
+"""시트별 원본 표를 합쳐 그래프용 데이터셋을 만드는 모듈"""
+import hashlib
+import logging
+from dataclasses import dataclass, replace
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+from price_parsing import parse_prices
+
+# 그래프로 그리는 지표 컬럼
+METRIC_COLUMNS = ['평단가', '매매가', '전세가', '갭가격', '하락/상승률']
+
+# 앱에서 쓰는 컬럼 (나머지 시트 컬럼은 로딩 후 버림)
+KEEP_COLUMNS = ['날짜', '단지명', '단지명_정제', '매매가', '전세가', '전고점', '총세대수', '평단가', '갭가격', '하락/상승률']
+# 시장 전체 분포 집계에 쓰는 분위수: 컬럼 접미사 -> 분위
+MARKET_QUANTILES = {'p10': 0.1, 'p25': 0.25, 'p50': 0.5, 'p75': 0.75, 'p90': 0.9}
+# 같은 날짜 안에서의 백분위 순위를 미리 계산해 두는 지표 (컬럼 이름: '<지표>_백분위')
+RANK_COLUMNS = ['평단가', '갭가격']
+# 여러 행에 반복되는 이름 컬럼은 범주형으로 저장
+CATEGORY_COLUMNS = ['단지명', '단지명_정제']
+
+logger = logging.getLogger(__name__)
+
+# pandas 3은 copy-on-write가 항상 켜져 있음 (2.x는 옵션이고 기본은 꺼짐)
+PANDAS_MAJOR = int(pd.__version__.split('.')[0])
+
+# 단지 선택 버튼 정렬 기준: 옵션 이름 -> (정렬 컬럼, 오름차순 여부)
+SORT_OPTIONS = {
+    "평단가": ("평단가", False),
+    "이름순": ("단지명_정제", True),
+    "갭가격": ("갭가격", False),
+    "총세대수": ("총세대수", False)
+}
+
+
+class SeriesIndex:
+    """단지명_정제별 시계열을 날짜순의 연속된 행 블록으로 모아 둔 인덱스
+
+    로딩 시 한 번 정렬해 두고 단지별 (시작, 끝) 위치만 기억하므로,
+    get()은 전체 표를 훑지 않고 슬라이스(복사 없음)만 돌려준다.
+    """
+
+    def __init__(self, df, key='단지명_정제', date_col='날짜', columns=None):
+        if columns is None:
+            columns = ['단지명'] + [col for col in METRIC_COLUMNS if col in df.columns]
+        ordered = df.dropna(subset=[key]).sort_values([key, date_col], kind='stable')
+        self.frame = ordered[[date_col, *columns]].reset_index(drop=True)
+
+        keys = ordered[key].to_numpy()
+        if len(keys):
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+            stops = np.r_[starts[1:], len(keys)]
+            self.offsets = {
+                name: (int(start), int(stop))
+                for name, start, stop in zip(keys[starts], starts, stops)
+            }
+        else:
+            self.offsets = {}
+
+    def __contains__(self, name):
+        return name in self.offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def get(self, name):
+        """단지의 날짜순 시계열 블록 (없으면 None)"""
+        span = self.offsets.get(name)
+        if span is None:
+            return None
+        return self.frame.iloc[span[0]:span[1]]
+
+
+def normalize_name(name):
+    """검색용 이름 키 (공백 제거, 소문자)"""
+    return str(name).replace(" ", "").strip().lower()
+
+
+class NameIndex:
+    """단지명_정제 부분 문자열 검색 인덱스
+
+    로딩 시 이름마다 글자와 두 글자 조각을 단지 번호 목록에 모아 두고, 검색할 때는
+    검색어 조각들의 목록을 교집합해 후보만 남긴 뒤 실제로 들어 있는지 확인한다.
+    이름 수가 늘어도 검색어 조각이 드문 만큼만 확인하면 된다.
+    """
+
+    def __init__(self, names):
+        self.names = tuple(names)
+        self._keys = tuple(normalize_name(name) for name in self.names)
+        postings = {}
+        for i, key in enumerate(self._keys):
+            for gram in set(key) | {key[j:j + 2] for j in range(len(key) - 1)}:
+                postings.setdefault(gram, []).append(i)
+        self._postings = {gram: np.asarray(ids, dtype=np.int32) for gram, ids in postings.items()}
+
+    def __len__(self):
+        return len(self.names)
+
+    def search(self, query):
+        """검색어가 들어 있는 단지명_정제 집합 (검색어가 비어 있으면 None = 전체)"""
+        key = normalize_name(query)
+        if not key:
+            return None
+        grams = [key] if len(key) == 1 else [key[j:j + 2] for j in range(len(key) - 1)]
+        lists = [self._postings.get(gram) for gram in grams]
+        if any(ids is None for ids in lists):
+            return frozenset()
+        # 짧은 목록부터 교집합
+        lists.sort(key=len)
+        candidates = lists[0]
+        for ids in lists[1:]:
+            candidates = np.intersect1d(candidates, ids, assume_unique=True)
+            if not len(candidates):
+                return frozenset()
+        return frozenset(self.names[i] for i in candidates if key in self._keys[i])
+
+
+def restore_precision(values, decimals=4):
+    """float32로 줄여 둔 값을 표시용 float64로 되돌리는 함수 (15.199999 -> 15.2)
+
+    가격의 실제 정밀도는 1만원(0.0001억)이므로 소수점 4자리로 반올림한다.
+    """
+    return values.astype('float64').round(decimals)
+
+
+def compact_frame(df):
+    """쓰는 컬럼만 남기고 이름은 범주형, 숫자는 float32로 줄이는 함수
+
+    (줄인 표, {'before_bytes': ..., 'after_bytes': ...}) 를 돌려준다.
+    """
+    before = int(df.memory_usage(deep=True).sum())
+    compact = df[[col for col in KEEP_COLUMNS if col in df.columns]].copy()
+    for col in CATEGORY_COLUMNS:
+        if col in compact.columns:
+            compact[col] = compact[col].astype('category')
+    for col in compact.columns:
+        if col in CATEGORY_COLUMNS or col == '날짜':
+            continue
+        values = compact[col]
+        if not pd.api.types.is_numeric_dtype(values):
+            # '1,234' 처럼 천 단위 구분자가 있는 문자열 숫자
+            values = values.astype(str).str.replace(',', '')
+        # 억 단위 가격과 세대수는 float32 유효숫자(약 7자리) 안에 들어감
+        compact[col] = pd.to_numeric(values, errors='coerce').astype('float32')
+    after = int(compact.memory_usage(deep=True).sum())
+    return compact, {'before_bytes': before, 'after_bytes': after}
+
+
+def compute_market_aggregates(merged_df, previous=None):
+    """날짜별 시장 집계표(지표별 분위수, 단지 수)를 만드는 함수
+
+    날짜 스냅샷은 한 번 게시되면 바뀌지 않으므로 previous에 이미 있는 날짜는 그대로 쓰고,
+    새로 생긴 날짜만 계산한다. 결과는 날짜 인덱스, '<지표>_<p10..p90>'과 '단지수' 컬럼.
+    """
+    dates = merged_df['날짜'].unique()
+    if previous is not None and not previous.empty:
+        previous = previous[previous.index.isin(dates)]
+        new_rows = merged_df[~merged_df['날짜'].isin(previous.index)]
+    else:
+        previous = None
+        new_rows = merged_df
+
+    metrics = [col for col in METRIC_COLUMNS if col in new_rows.columns]
+    if new_rows.empty or not metrics:
+        return previous if previous is not None else pd.DataFrame(index=pd.DatetimeIndex([], name='날짜'))
+
+    grouped = new_rows.groupby('날짜', observed=True)
+    quantiles = grouped[metrics].quantile(list(MARKET_QUANTILES.values())).unstack()
+    labels = {q: label for label, q in MARKET_QUANTILES.items()}
+    quantiles.columns = [f"{metric}_{labels[q]}" for metric, q in quantiles.columns]
+    quantiles['단지수'] = grouped['단지명_정제'].nunique()
+    aggregates = quantiles.astype('float32')
+
+    if previous is not None:
+        aggregates = pd.concat([previous, aggregates])
+    return aggregates.sort_index()
+
+
+def add_rank_columns(merged_df):
+    """같은 날짜 안에서 지표의 백분위 순위(0~1, 클수록 높음) 컬럼을 추가하는 함수"""
+    grouped = merged_df.groupby('날짜', observed=True)
+    for col in RANK_COLUMNS:
+        if col in merged_df.columns:
+            merged_df[f"{col}_백분위"] = grouped[col].rank(pct=True).astype('float32')
+    return merged_df
+
+
+def data_version(df):
+    """표 내용이 바뀌면 달라지는 짧은 해시 (그래프 캐시 키로 사용)"""
+    hashed = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return hashlib.sha256(hashed.tobytes()).hexdigest()[:16]
+
+
+def _label_values(df, option):
+    """정렬 기준에 맞는 버튼 라벨 뒤쪽 값 문자열을 한 번에 만드는 함수 (값이 없으면 빈 문자열)"""
+    empty = pd.Series("", index=df.index, dtype=object)
+    if df.empty:
+        return empty
+    if option == "평단가" and '평단가' in df.columns:
+        values = restore_precision(df['평단가'])
+        return empty.mask(values.notna(), "(" + values.map('{:,.0f}'.format) + ")")
+    elif option == "갭가격" and '갭가격' in df.columns:
+        # 갭가격은 소수점 표시
+        values = restore_precision(df['갭가격'])
+        return empty.mask(values.notna(), "(" + values.map('{:,.1f}'.format) + ")")
+    elif option == "총세대수" and '총세대수' in df.columns:
+        values = pd.to_numeric(df['총세대수'], errors='coerce')
+        counts = values.fillna(0).astype('int64').map('{:,}'.format)
+        return empty.mask(values.notna(), "(" + counts + "세대)")
+    return empty
+
+
+def build_selector_rows(latest_df):
+    """정렬 기준별로 (단지명_정제, 버튼 라벨, 버튼 키) 튜플 목록을 미리 만드는 함수
+
+    재실행마다 행 단위로 iloc 접근하며 라벨을 만들지 않도록, 로딩 시 기준별로 한 번만 계산한다.
+    """
+    rows = {}
+    if latest_df.empty:
+        return {option: [] for option in SORT_OPTIONS}
+
+    for option, (sort_key, ascending) in SORT_OPTIONS.items():
+        if sort_key in latest_df.columns:
+            sortable = latest_df.dropna(subset=[sort_key]).sort_values(by=sort_key, ascending=ascending)
+        else:
+            sortable = latest_df
+        labels = sortable['단지명'].astype(str) + " " + _label_values(sortable, option)
+        keys = "btn_" + sortable['단지명_정제'].astype(str)
+        rows[option] = list(zip(sortable['단지명_정제'].tolist(), labels.tolist(), keys.tolist()))
+    return rows
+
+
+def build_latest_lookup(latest_df):
+    """단지명_정제 -> {'단지명': 표시 이름, 지표: 최신 값} 사전을 만드는 함수
+
+    같은 단지명_정제가 여러 행이면 첫 행을 사용한다.
+    """
+    if latest_df.empty:
+        return {}
+    rank_columns = [f"{col}_백분위" for col in RANK_COLUMNS]
+    columns = ['단지명'] + [col for col in METRIC_COLUMNS + ['총세대수'] + rank_columns if col in latest_df.columns]
+    first_rows = latest_df.dropna(subset=['단지명_정제']).drop_duplicates('단지명_정제', keep='first')
+    first_rows = first_rows.set_index('단지명_정제')[columns]
+    for col in columns[1:]:
+        if pd.api.types.is_float_dtype(first_rows[col]):
+            first_rows[col] = restore_precision(first_rows[col])
+    return first_rows.astype({'단지명': object}).to_dict('index')
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """load_data()가 돌려주는 데이터 묶음"""
+    merged_df: pd.DataFrame
+    latest_df: pd.DataFrame
+    series_index: SeriesIndex
+    version: str
+    # 정렬 기준별 선택 버튼 (단지명_정제, 라벨, 키) 목록
+    selector_rows: dict
+    # 단지명_정제 -> 표시 이름과 최신 지표
+    latest_lookup: dict
+    # 선택 버튼 검색용 단지명_정제 인덱스
+    name_index: NameIndex
+    # compact_frame() 전후 merged_df 메모리 사용량
+    memory_report: dict
+    # 날짜별 시장 집계표 (compute_market_aggregates 참고)
+    market: pd.DataFrame
+
+
+def _freeze_frame(df):
+    """표의 모든 컬럼 배열을 쓰기 금지로 바꾸는 함수 (공유 중인 표를 제자리 수정하면 ValueError)"""
+    for col in df.columns:
+        values = df[col].array
+        array = values.codes if isinstance(values, pd.Categorical) else np.asarray(values)
+        # 뷰가 아니라 실제 메모리를 가진 원본 배열까지 올라가서 막아야 이후 뷰도 읽기 전용이 됨
+        while isinstance(array.base, np.ndarray):
+            array = array.base
+        if isinstance(array, np.ndarray) and array.dtype != object:
+            array.flags.writeable = False
+    return df
+
+
+def freeze_dataset(dataset):
+    """여러 세션이 복사 없이 함께 쓸 수 있도록 데이터셋을 읽기 전용으로 만드는 함수
+
+    Dataset 자체는 frozen dataclass라 속성을 바꿀 수 없고, 표의 배열과 사전도 수정을 막는다.
+    """
+    for df in (dataset.merged_df, dataset.latest_df, dataset.series_index.frame, dataset.market):
+        _freeze_frame(df)
+    return replace(
+        dataset,
+        selector_rows=MappingProxyType({
+            option: tuple(rows) for option, rows in dataset.selector_rows.items()
+        }),
+        latest_lookup=MappingProxyType({
+            name: MappingProxyType(info) for name, info in dataset.latest_lookup.items()
+        }),
+    )
+
+
+def copy_on_write_enabled():
+    return PANDAS_MAJOR >= 3 or pd.options.mode.copy_on_write is True
+
+
+def enable_copy_on_write():
+    """pandas 2.x에서 copy-on-write를 켜는 함수 (pandas 3은 할 일 없음)
+
+    프로세스 전체 설정이라 모듈을 불러올 때가 아니라 공유 데이터셋을 쓰는 앱이 시작할 때 부른다.
+    """
+    if PANDAS_MAJOR < 3:
+        pd.options.mode.copy_on_write = True
+
+
+def session_view(dataset):
+    """공유 데이터셋의 표를 세션용 얕은 복사본으로 감싸는 함수
+
+    copy-on-write가 켜져 있으면 데이터 배열은 복사하지 않는다. 세션 쪽에서 컬럼을 추가하거나
+    값을 바꿔도 공유 원본은 바뀌지 않는다. 꺼져 있으면(pandas 2.x 기본값) 얕은 복사본에 쓴 값이
+    공유 원본에 들어가므로 표를 깊은 복사한다.
+    """
+    deep = not copy_on_write_enabled()
+    return replace(
+        dataset,
+        merged_df=dataset.merged_df.copy(deep=deep),
+        latest_df=dataset.latest_df.copy(deep=deep),
+    )
+
+
+def clean_frames(all_data):
+    """시트별 원본 표를 합쳐 정리하고 파생 지표를 계산한 뒤 compact_frame()까지 마친 (표, 메모리 보고)"""
+    # 원본마다 머리글 앞뒤 공백이 섞여 있을 수 있어 컬럼 이름부터 맞춤
+    merged_df = pd.concat(
+        [df.rename(columns=lambda col: str(col).strip()) for df in all_data], ignore_index=True,
+    )
+    merged_df = merged_df.dropna(subset=['단지명'])
+    merged_df.sort_values('날짜', inplace=True)
+    merged_df['단지명'] = merged_df['단지명'].astype(str).str.strip()
+    merged_df['단지명_정제'] = merged_df['단지명'].str.replace(" ", "")
+
+    # 숫자형으로 변환해야 할 모든 열을 처리
+    # '매매가', '전세가' 등은 '억' 단위의 실수(e.g., 15.2)로 변환 (억/만 표기도 처리)
+    for col in ['매매가', '전고점', '전세가']:
+        if col in merged_df.columns:
+            merged_df[col] = parse_prices(merged_df[col])
+
+    # 그래프에 필요한 모든 데이터 컬럼 계산
+    # '매매가'가 '억' 단위이므로 '평단가'를 '만원' 단위로 계산
+    merged_df['평단가'] = (merged_df['매매가'] * 10000) / 24
+    # '갭가격'은 '억' 단위로 계산됨
+    merged_df['갭가격'] = merged_df['매매가'] - merged_df['전세가']
+    # 전고점이 없는 원본(엑셀 통합문서 등)은 하락/상승률을 비워 둠
+    if '전고점' in merged_df.columns:
+        merged_df['하락/상승률'] = ((merged_df['매매가'] / merged_df['전고점'] * 100) - 100).round(1)
+    else:
+        merged_df['하락/상승률'] = np.nan
+
+    # 쓰는 컬럼만 남기고 이름은 범주형, 숫자는 float32로 줄임 (캐시 직렬화/복사 비용 감소)
+    merged_df, memory_report = compact_frame(merged_df)
+    logger.info(
+        "merged_df 메모리: %.2f MB -> %.2f MB",
+        memory_report['before_bytes'] / 1e6, memory_report['after_bytes'] / 1e6,
+    )
+    return merged_df, memory_report
+
+
+def append_dates(previous_merged, new_df):
+    """이전 merged_df(백분위 포함)에 새 날짜의 행을 이어 붙이는 함수
+
+    범주형 컬럼은 이전 범주 뒤에 새 이름만 덧붙여 맞추므로 이전 행의 코드는 그대로다.
+    """
+    previous_merged = previous_merged.copy(deep=False)
+    new_df = new_df.copy(deep=False)
+    for col in CATEGORY_COLUMNS:
+        if col in previous_merged.columns and col in new_df.columns:
+            categories = previous_merged[col].cat.categories
+            extra = new_df[col].cat.categories.difference(categories)
+            if len(extra):
+                categories = categories.append(extra)
+                previous_merged[col] = previous_merged[col].cat.set_categories(categories)
+            new_df[col] = new_df[col].cat.set_categories(categories)
+
+    merged_df = pd.concat([previous_merged, new_df], ignore_index=True)
+    # 보통은 새 날짜가 가장 최근이라 다시 정렬할 필요가 없음
+    if len(previous_merged) and len(new_df) and new_df['날짜'].min() <= previous_merged['날짜'].max():
+        merged_df = merged_df.sort_values('날짜', kind='stable', ignore_index=True)
+    return merged_df
+
+
+def prepare_dataset(all_data, previous_market=None, previous_merged=None):
+    """날짜 컬럼이 붙은 시트별 표 목록으로 병합 표, 최신 표, 단지별 인덱스, 시장 집계를 만드는 함수
+
+    모든 원본(sources.py)의 정리와 파생 지표 계산을 여기서 한 번에 한다.
+    previous_market에 이전 로딩의 시장 집계표를 넘기면 새 날짜만 집계한다.
+    previous_merged에 이전 로딩의 merged_df(백분위 컬럼 포함)를 넘기면 그 표에 이미 있는 날짜의
+    시트는 다시 정리하지 않고 그 행을 그대로 쓰며, 새 날짜만 정리하고 백분위를 계산해 이어 붙인다.
+    날짜 스냅샷은 한 번 게시되면 바뀌지 않는다는 전제이므로 원본 내용이 바뀌었으면 넘기지 않는다.
+    """
+    if previous_merged is not None and len(previous_merged):
+        known = previous_merged['날짜'].unique()
+        all_data = [df for df in all_data if not df['날짜'].isin(known).all()]
+    else:
+        previous_merged = None
+
+    if not all_data and previous_merged is None:
+        empty = pd.DataFrame()
+        series_index = SeriesIndex(pd.DataFrame(columns=['단지명_정제', '날짜']))
+        return Dataset(
+            merged_df=empty,
+            latest_df=empty,
+            series_index=series_index,
+            version=data_version(series_index.frame),
+            selector_rows=build_selector_rows(empty),
+            latest_lookup={},
+            name_index=NameIndex([]),
+            memory_report={'before_bytes': 0, 'after_bytes': 0},
+            market=pd.DataFrame(index=pd.DatetimeIndex([], name='날짜')),
+        )
+
+    if all_data:
+        merged_df, memory_report = clean_frames(all_data)
+        # 날짜 내 백분위 순위 (재실행마다 groupby 하지 않도록 로딩 시 계산, 날짜별이라 새 날짜만 계산하면 됨)
+        merged_df = add_rank_columns(merged_df)
+    else:
+        merged_df, memory_report = previous_merged.iloc[:0], {'before_bytes': 0, 'after_bytes': 0}
+
+    if previous_merged is not None:
+        previous_bytes = int(previous_merged.memory_usage(deep=True).sum())
+        merged_df = append_dates(previous_merged, merged_df)
+        memory_report = {
+            'before_bytes': memory_report['before_bytes'] + previous_bytes,
+            'after_bytes': int(merged_df.memory_usage(deep=True).sum()),
+        }
+
+    # 시장 비교용 날짜별 집계 (이전 집계표에 있는 날짜는 다시 계산하지 않음)
+    market = compute_market_aggregates(merged_df, previous_market)
+    return assemble_dataset(merged_df, market, memory_report)
+
+
+def assemble_dataset(merged_df, market, memory_report):
+    """정리와 파생 지표 계산이 끝난 merged_df와 시장 집계표로 나머지 구성 요소를 만드는 함수
+
+    prepare_dataset()의 마지막 단계이고, 미리 만들어 둔 아티팩트(artifact.py)를 읽을 때도 쓴다.
+    """
+    # 가장 최신 데이터 추출
+    latest_date = merged_df['날짜'].max()
+    latest_df = merged_df[merged_df['날짜'] == latest_date].copy()
+
+    series_index = SeriesIndex(merged_df)
+    latest_lookup = build_latest_lookup(latest_df)
+    return Dataset(
+        merged_df=merged_df,
+        latest_df=latest_df,
+        series_index=series_index,
+        version=data_version(series_index.frame),
+        selector_rows=build_selector_rows(latest_df),
+        latest_lookup=latest_lookup,
+        name_index=NameIndex(latest_lookup),
+        memory_report=memory_report,
+        market=market,
+    )
@@ -0,0 +1,35 @@
+"""main.py Dash 앱 운영 서버 설정 (gunicorn)
+
+    pip install -r requirements-dash.txt
+    python ingest.py workbook                  # (권장) 데이터셋 아티팩트를 미리 만들어 둠
+    gunicorn -c gunicorn.conf.py main:server
+
+preload_app으로 마스터 프로세스가 main.py를 한 번만 import해서 데이터셋과 Dash 레이아웃을 만들고,
+워커는 fork로 그 메모리를 복사 없이 공유한다 (워커마다 다운로드/파싱/정리를 반복하지 않음).
+데이터셋 숫자 배열은 아티팩트 파일의 메모리 맵이라 preload를 끄더라도 페이지 캐시를 함께 쓴다.
+
+환경 변수
+- BOODONGSAN_GUNICORN_BIND: 주소 (기본값 0.0.0.0:8050)
+- BOODONGSAN_GUNICORN_WORKERS: 워커 프로세스 수 (기본값 CPU 수)
+- BOODONGSAN_GUNICORN_THREADS: 워커당 스레드 수 (기본값 4, 1이면 sync 워커)
+- BOODONGSAN_GUNICORN_PRELOAD: 0이면 워커마다 main.py를 따로 import (메모리 비교용)
+"""
+import gc
+import multiprocessing
+import os
+
+bind = os.environ.get('BOODONGSAN_GUNICORN_BIND', '0.0.0.0:8050')
+workers = int(os.environ.get('BOODONGSAN_GUNICORN_WORKERS', multiprocessing.cpu_count()))
+threads = int(os.environ.get('BOODONGSAN_GUNICORN_THREADS', 4))
+worker_class = 'gthread' if threads > 1 else 'sync'
+preload_app = os.environ.get('BOODONGSAN_GUNICORN_PRELOAD', '1') != '0'
+# 그래프 콜백은 짧으므로 오래 걸리는 요청은 워커 이상으로 보고 재시작
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
+
+
+def pre_fork(server, worker):
+    # 마스터에서 만든 객체를 GC 추적에서 빼 둠. 워커의 GC가 이 객체들의 헤더를 건드려
+    # 공유 중인 페이지가 워커마다 복사되는 것을 줄임
+    gc.freeze()
@@ -0,0 +1,150 @@
+"""조건부 요청(ETag/Last-Modified)과 디스크 응답 캐시를 갖춘 HTTP 모듈
+
+같은 URL을 다시 받을 때 이전 응답의 ETag/Last-Modified를 If-None-Match/If-Modified-Since로
+보내서, 바뀌지 않았으면 서버는 304만 돌려주고 본문은 디스크 캐시에서 읽는다.
+연결은 프로세스에 하나 둔 requests.Session의 연결 풀을 함께 쓰고, 압축(gzip) 응답을 받는다.
+
+검증자(ETag/Last-Modified)를 주지 않는 응답은 캐시하지 않는다 (바뀌었는지 확인할 방법이 없으므로).
+"""
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import requests
+from requests.adapters import HTTPAdapter
+
+HTTP_CACHE_DIR = os.environ.get('BOODONGSAN_HTTP_CACHE_DIR', './http_cache')
+# 0이면 디스크 응답 캐시와 조건부 요청을 쓰지 않음
+USE_HTTP_CACHE = os.environ.get('BOODONGSAN_HTTP_CACHE', '1') != '0'
+# 호스트별로 열어 두는 연결 수 (sheet_fetcher의 동시 다운로드 수보다 크게)
+POOL_SIZE = 16
+DEFAULT_TIMEOUT = 20
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+
+@dataclass
+class HttpResponse:
+    """본문과 그 본문을 어디서 얻었는지 (not_modified면 서버가 304를 주고 디스크 캐시에서 읽은 것)"""
+    url: str
+    content: bytes
+    status: int
+    not_modified: bool = False
+    etag: str = None
+    last_modified: str = None
+
+
+class ResponseCache:
+    """URL 하나당 본문 파일(<키>.body)과 검증자 파일(<키>.json)을 두는 디스크 캐시"""
+
+    def __init__(self, root=HTTP_CACHE_DIR):
+        self.root = root
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
+        return os.path.join(self.root, f'{key}.json'), os.path.join(self.root, f'{key}.body')
+
+    def load(self, url):
+        """(검증자 사전, 본문) (없거나 깨졌으면 None)"""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                content = f.read()
+        except (OSError, ValueError):
+            return None
+        if meta.get('url') != url or meta.get('size') != len(content):
+            return None
+        return meta, content
+
+    def save(self, url, content, etag=None, last_modified=None):
+        os.makedirs(self.root, exist_ok=True)
+        meta_path, body_path = self._paths(url)
+        meta = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'size': len(content),
+            'fetched_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        }
+        # 본문을 먼저 바꾼 뒤 검증자를 바꿈 (중간에 멈추면 크기가 맞지 않아 캐시를 무시)
+        for path, data in [(body_path, content), (meta_path, json.dumps(meta, ensure_ascii=False).encode('utf-8'))]:
+            tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+
+_session = None
+_session_lock = threading.Lock()
+_default_cache = ResponseCache() if USE_HTTP_CACHE else None
+
+
+def get_session():
+    """프로세스에서 함께 쓰는 requests.Session (연결 재사용)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update({'User-Agent': USER_AGENT, 'Accept-Encoding': 'gzip, deflate'})
+            _session = session
+        return _session
+
+
+def fetch(url, timeout=DEFAULT_TIMEOUT, cache=None, session=None):
+    """URL 본문을 받는 함수 (캐시에 검증자가 있으면 조건부 요청, 304면 캐시 본문을 돌려줌)
+
+    cache를 주지 않으면 기본 디스크 캐시(BOODONGSAN_HTTP_CACHE=0이면 캐시 없음)를 쓴다.
+    4xx/5xx 응답과 캐시 본문 없이 받은 304(조건 없이 다시 요청해도 304)는 requests.HTTPError로 올린다.
+    """
+    cache = cache if cache is not None else _default_cache
+    session = session or get_session()
+
+    cached = cache.load(url) if cache is not None else None
+    headers = {}
+    if cached is not None:
+        meta = cached[0]
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+    response = session.get(url, headers=headers, timeout=timeout)
+    if response.status_code == 304:
+        if cached is not None:
+            meta, content = cached
+            return HttpResponse(url, content, 304, True, meta.get('etag'), meta.get('last_modified'))
+        # 캐시 본문이 없는데 304가 오면 빈 본문을 시트 내용으로 쓰게 되므로 조건 없이 다시 요청
+        response = session.get(url, headers={'Cache-Control': 'no-cache'}, timeout=timeout)
+        if response.status_code == 304:
+            raise requests.HTTPError(f'304 Not Modified인데 캐시된 본문이 없음: {url}', response=response)
+    response.raise_for_status()
+
+    content = response.content
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if cache is not None and (etag or last_modified):
+        try:
+            cache.save(url, content, etag, last_modified)
+        except OSError:
+            # 캐시에 못 써도 받은 본문은 그대로 사용
+            pass
+    return HttpResponse(url, content, response.status_code, False, etag, last_modified)
+
+
+def validators(url, timeout=DEFAULT_TIMEOUT, session=None):
+    """본문을 받지 않고(HEAD) 현재 (ETag, Last-Modified)를 확인하는 함수 (리다이렉트는 따라감)
+
+    서버가 검증자를 주지 않으면 (None, None). 4xx/5xx 응답은 requests.HTTPError로 올린다.
+    """
+    session = session or get_session()
+    response = session.head(url, timeout=timeout, allow_redirects=True)
+    response.raise_for_status()
+    return response.headers.get('ETag'), response.headers.get('Last-Modified')
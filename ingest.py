@@ -0,0 +1,147 @@
+"""원본(sources.py)에서 데이터셋을 만들고 아티팩트로 저장/재사용하는 모듈 (명령줄 도구 겸용)
+
+app.py와 main.py 모두 load_dataset()으로 데이터셋을 얻는다. 원본이 무엇이든 정리와 파생 지표
+계산은 dataset.prepare_dataset() 한 곳에서 하고, 결과는 원본별 아티팩트 하나에 저장해 두어
+다음 프로세스(다른 워커, 재시작)는 다운로드/파싱/정리 없이 메모리 맵으로 읽어서 바로 시작한다.
+
+    python ingest.py sheets                      # app.py용 (구글 시트 날짜 탭)
+    python ingest.py workbook                    # main.py용 (드라이브 엑셀 통합문서)
+    python ingest.py workbook --xlsx 통합문서.xlsx
+    python ingest.py local --dir snapshots/      # <날짜>.csv / <날짜>.parquet 파일 디렉토리
+"""
+import argparse
+import logging
+import sys
+import time
+
+import perf
+from artifact import ARTIFACT_DIR, USE_ARTIFACT, load_dataset_artifact, save_dataset_artifact
+from dataset import prepare_dataset
+from sources import SHEET_ID, XLSX_PATH, GvizSource, LocalSource, WorkbookSource
+
+logger = logging.getLogger(__name__)
+
+
+def build_dataset(source, names, warn=logger.warning, error=logger.error, previous=None):
+    """원본의 스냅샷들을 읽어 prepare_dataset()까지 마친 (Dataset, 불러오지 못한 스냅샷 목록)
+
+    warn/error는 스냅샷별 문제를 알리는 함수 (app.py에서는 화면에 모아서 보여줌).
+    previous에 같은 원본 내용으로 만든 이전 데이터셋을 넘기면 그 데이터셋에 있는 스냅샷은
+    다시 읽지 않고 행과 백분위를 그대로 쓰며, 새 스냅샷만 읽어서 이어 붙인다.
+    """
+    previous_merged = None
+    load_names = names
+    if previous is not None and len(previous.merged_df):
+        dates = [source.date(name) for name in names]
+        previous_merged = previous.merged_df[previous.merged_df['날짜'].isin(dates)]
+        known = set(previous_merged['날짜'].unique())
+        load_names = [name for name, date in zip(names, dates) if date not in known]
+
+    frames = source.load(load_names, error=error)
+    # 병합, 파생 지표 계산, 단지별 시계열 인덱스, 시장 집계는 로딩 시 한 번만 수행
+    # (이전 로딩의 시장 집계와 병합 표를 넘겨서 새 날짜만 집계하고 백분위를 계산)
+    with perf.stage('prepare_dataset', sheets=len(frames), reused=len(names) - len(load_names)):
+        dataset = prepare_dataset(frames, source.previous_market(), previous_merged)
+    source.save_market(dataset.market, warn=warn)
+
+    loaded = set(dataset.merged_df['날짜'].unique()) if len(dataset.merged_df) else set()
+    missing = [name for name in names if source.date(name) not in loaded]
+    return dataset, missing
+
+
+def _covers(meta, source, names):
+    # 아티팩트가 요청한 스냅샷을 모두 담고 있고 원본 내용도 같을 때만 사용
+    return set(names) <= set(meta.get('sheets', [])) and meta.get('source_version') == source.version
+
+
+def save_artifact(source, dataset, names, root=ARTIFACT_DIR):
+    meta = {'source': type(source).__name__, 'source_version': source.version, 'sheets': list(names)}
+    return save_dataset_artifact(dataset, meta, root, name=source.name)
+
+
+def load_dataset(source, names=None, warn=logger.warning, error=logger.error, root=ARTIFACT_DIR,
+                 use_artifact=USE_ARTIFACT):
+    """원본의 데이터셋을 돌려주는 함수: (Dataset, 불러오지 못한 스냅샷 목록)
+
+    names를 주지 않으면 원본에서 스냅샷 목록을 찾는다. 아티팩트가 그 목록을 모두 담고 있으면
+    메모리 맵으로 읽어서 쓰고, 아니면 아티팩트에 없는 스냅샷만 읽어 이어 붙인 뒤 아티팩트로 저장해 둔다.
+    names 없이 부를 때 원본의 probe()가 아티팩트와 같은 버전을 알려 주면 스냅샷 목록도 찾지 않고
+    아티팩트를 쓰고, 스냅샷 목록을 찾지 못하면(오프라인 등) 경고를 남기고 마지막 아티팩트를 쓴다.
+    """
+    artifact = meta = None
+    if use_artifact:
+        with perf.stage('load_artifact', source=source.name) as info:
+            artifact, meta = load_dataset_artifact(root, name=source.name)
+            info['found'] = artifact is not None
+            # 통합문서처럼 받지 않고도 버전을 알 수 있는 원본은 다운로드/파싱 전에 먼저 비교
+            info['probe_matched'] = (
+                artifact is not None and names is None
+                and meta.get('source_version') is not None and source.probe(warn) == meta['source_version']
+            )
+        if info['probe_matched']:
+            return artifact, []
+
+    if names is None:
+        try:
+            names = source.discover(warn)
+        except Exception as e:
+            if artifact is None:
+                raise
+            warn(f"원본에서 스냅샷 목록을 찾지 못해 저장된 아티팩트를 사용합니다: {e}")
+            return artifact, []
+    names = tuple(names)
+
+    previous = None
+    if artifact is not None:
+        if _covers(meta, source, names):
+            return artifact, []
+        # 원본 내용이 같으면 (새 탭만 생긴 경우) 아티팩트에 있는 스냅샷은 다시 읽지 않음
+        if meta.get('source_version') == source.version:
+            previous = artifact
+
+    dataset, missing = build_dataset(source, names, warn=warn, error=error, previous=previous)
+    if use_artifact and len(dataset.merged_df):
+        try:
+            save_artifact(source, dataset, [name for name in names if name not in missing], root)
+        except Exception as e:
+            warn(f"아티팩트 저장 실패: {e}")
+    return dataset, missing
+
+
+def ingest(source, root=ARTIFACT_DIR):
+    """원본 전체로 데이터셋을 새로 만들어 아티팩트로 저장 (버전 디렉토리 경로 반환)"""
+    names = source.discover()
+    dataset, missing = build_dataset(source, names)
+    if dataset.merged_df.empty:
+        raise RuntimeError('불러온 스냅샷이 없어 아티팩트를 만들지 않습니다.')
+    if missing:
+        logger.warning("불러오지 못한 스냅샷: %s", ', '.join(missing))
+    return save_artifact(source, dataset, [name for name in names if name not in missing], root)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('source', choices=['sheets', 'workbook', 'local'])
+    parser.add_argument('--root', default=ARTIFACT_DIR, help='아티팩트 디렉토리')
+    parser.add_argument('--xlsx', default=XLSX_PATH, help='workbook: 드라이브 대신 읽을 로컬 엑셀 파일')
+    parser.add_argument('--sheet-id', default=SHEET_ID, help='sheets: 구글 스프레드시트 ID')
+    parser.add_argument('--dir', help='local: 스냅샷 파일 디렉토리')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    if args.source == 'sheets':
+        source = GvizSource(args.sheet_id)
+    elif args.source == 'workbook':
+        source = WorkbookSource(args.xlsx)
+    else:
+        if not args.dir:
+            parser.error('local 원본은 --dir이 필요합니다.')
+        source = LocalSource(args.dir)
+
+    start = time.perf_counter()
+    path = ingest(source, args.root)
+    print(f'{path} ({time.perf_counter() - start:.1f}초)')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
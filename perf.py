@@ -0,0 +1,128 @@
+"""단계별 실행 시간 계측 모듈
+
+stage()로 감싼 구간과 record()로 넘긴 측정값은 JSON 한 줄씩 로그로 남기고,
+start_run()으로 시작한 재실행이 있으면 그 재실행의 events에도 모아 둔다 (app.py 디버그 패널용).
+
+로그 출력은 BOODONGSAN_PERF_LOG 환경 변수로 정한다.
+'1'(기본값)이면 표준 에러, '0'이면 끔, 그 밖의 값은 로그 파일 경로로 본다.
+"""
+import contextvars
+import json
+import logging
+import os
+import time
+import uuid
+from contextlib import contextmanager
+
+PERF_LOG = os.environ.get('BOODONGSAN_PERF_LOG', '1')
+
+logger = logging.getLogger(__name__)
+
+# 현재 스레드(세션의 스크립트 실행)에서 측정 중인 재실행
+_current_run = contextvars.ContextVar('perf_run', default=None)
+
+
+def _configure_logger():
+    # 다른 로그와 섞이지 않도록 메시지(JSON)만 그대로 출력 (끈 경우에도 루트 로거로 새지 않게 함)
+    logger.propagate = False
+    if logger.handlers or PERF_LOG == '0':
+        return
+    handler = logging.StreamHandler() if PERF_LOG == '1' else logging.FileHandler(PERF_LOG, encoding='utf-8')
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+
+_configure_logger()
+
+
+class RunTimer:
+    """재실행 한 번 동안의 측정값 묶음"""
+
+    def __init__(self, **fields):
+        self.run_id = uuid.uuid4().hex[:8]
+        self.fields = fields
+        self.events = []
+        # 아직 끝나지 않은 stage의 이름 -> 필드 (annotate()로 값을 덧붙일 수 있음)
+        self.open_stages = {}
+        self.started = time.perf_counter()
+        self.finished = False
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+def start_run(**fields):
+    """새 재실행 측정을 시작하고 현재 재실행으로 등록"""
+    run = RunTimer(**fields)
+    _current_run.set(run)
+    return run
+
+
+def current_run():
+    return _current_run.get()
+
+
+def record(name, seconds, **fields):
+    """측정값 하나를 현재 재실행에 모으고 JSON 로그로 남김"""
+    event = {'stage': name, 'ms': round(seconds * 1000, 2), **fields}
+    run = _current_run.get()
+    line = event
+    if run is not None:
+        run.events.append(event)
+        line = {'run': run.run_id, **run.fields, **event}
+    logger.info(json.dumps(line, ensure_ascii=False, default=str))
+    return event
+
+
+@contextmanager
+def stage(name, **fields):
+    """with 블록의 실행 시간을 record()로 남기는 컨텍스트 관리자
+
+    블록 안에서 돌려받은 dict에 값을 넣으면 같은 로그 줄에 함께 기록된다.
+    """
+    info = dict(fields)
+    run = _current_run.get()
+    if run is not None:
+        run.open_stages[name] = info
+    start = time.perf_counter()
+    try:
+        yield info
+    finally:
+        if run is not None:
+            run.open_stages.pop(name, None)
+        record(name, time.perf_counter() - start, **info)
+
+
+def annotate(name, **fields):
+    """현재 재실행에서 진행 중인 stage에 필드를 덧붙임 (진행 중이 아니면 무시)"""
+    run = _current_run.get()
+    if run is not None and name in run.open_stages:
+        run.open_stages[name].update(fields)
+
+
+def finish_run():
+    """재실행 전체 시간을 기록 (st.rerun()으로 중간에 끝난 재실행은 남지 않음)"""
+    run = _current_run.get()
+    if run is None or run.finished:
+        return None
+    event = record('rerun', run.elapsed(), stages=len(run.events))
+    run.finished = True
+    return event
+
+
+@contextmanager
+def run_scope(**fields):
+    """진행 중인 재실행이 있으면 그 안에서 측정하고, 없으면 새 재실행으로 측정해 끝날 때 기록
+
+    st.fragment 함수처럼 페이지 전체 실행 중에도, 따로 다시 실행될 때도 불리는 코드에 쓴다.
+    """
+    run = _current_run.get()
+    if run is not None and not run.finished:
+        yield run
+        return
+    run = start_run(**fields)
+    try:
+        yield run
+    finally:
+        finish_run()
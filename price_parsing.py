@@ -0,0 +1,56 @@
+"""시트의 가격 셀을 '억' 단위 실수로 바꾸는 공용 모듈 (app.py, main.py 공통)
+
+처리 규칙
+- 천 단위 구분자(,)와 공백은 무시: '1,234.5' -> 1234.5
+- 빈 칸, '-' 같은 자리표시 문자는 NaN
+- 음수 부호는 유지: '-1.5' -> -1.5
+- 단위가 없으면 억 단위로 봄: '15.2' -> 15.2
+- 억/만 표기: '15억' -> 15.0, '15억 2,000' / '15억2000만' -> 15.2, '8,500만' -> 0.85
+"""
+import numpy as np
+import pandas as pd
+
+# 억/만 표기가 섞인 셀: (부호)(억 앞 숫자)억(만 단위 숫자)(만)(원)
+_UNIT_PATTERN = (
+    r'^(?P<sign>-)?'
+    r'(?:(?P<eok>\d+(?:\.\d+)?)억)?'
+    r'(?:(?P<man>\d+(?:\.\d+)?)(?P<man_unit>만)?)?'
+    r'원?$'
+)
+
+# 값이 없음을 뜻하는 자리표시 문자 (astype(str) 결과의 'nan', 'None' 포함)
+_PLACEHOLDERS = ['', '-', '–', '—', 'nan', 'NaN', 'None', '<NA>']
+
+
+def parse_prices(values):
+    """가격 셀 Series를 억 단위 float64 Series로 바꾸는 함수 (해석할 수 없는 값은 NaN)"""
+    values = pd.Series(values) if not isinstance(values, pd.Series) else values
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype('float64')
+
+    text = values.astype(str).str.replace(',', '', regex=False).str.strip()
+    text = text.mask(text.isin(_PLACEHOLDERS), 'nan')
+    # 대부분의 시트는 단위 없는 숫자뿐이므로 한 번의 astype으로 끝냄
+    try:
+        return text.astype('float64')
+    except ValueError:
+        pass
+
+    # 숫자가 아닌 셀이 섞여 있으면 변환 가능한 셀만 변환하고 나머지는 NaN
+    # (object 배열로 넘기는 쪽이 문자열 확장 타입보다 변환이 빠름)
+    parsed = pd.Series(
+        pd.to_numeric(text.to_numpy(dtype=object), errors='coerce'), index=text.index, dtype='float64'
+    )
+
+    # 억/만 표기가 있는 셀만 정규식으로 분해
+    has_unit = parsed.isna() & text.str.contains('[억만]', regex=True)
+    if has_unit.any():
+        parts = text[has_unit].str.replace(r'\s', '', regex=True).str.extract(_UNIT_PATTERN)
+        eok = pd.to_numeric(parts['eok'], errors='coerce')
+        man = pd.to_numeric(parts['man'], errors='coerce')
+        # '15억 2000'처럼 억 뒤에 오는 숫자와 '8500만'의 숫자는 만원 단위
+        total = eok.fillna(0) + man.fillna(0) / 10000
+        total = total.where(eok.notna() | man.notna())
+        sign = np.where(parts['sign'].eq('-'), -1.0, 1.0)
+        parsed.loc[has_unit] = (total * sign).to_numpy()
+    return parsed
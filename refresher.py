@@ -0,0 +1,113 @@
+"""데이터셋을 백그라운드에서 다시 만들어 바꿔 끼우는 모듈 (stale-while-revalidate)
+
+세션은 current()로 마지막으로 완성된 데이터셋을 기다림 없이 받는다.
+백그라운드 스레드가 주기적으로(또는 request_refresh() 요청 시) 탭 목록을 다시 확인하고,
+새 탭이 생겼거나 빠진 탭이 있을 때만 데이터셋을 새로 만든 뒤 참조 하나를 바꿔서 교체한다.
+처음 한 번은 데이터가 없으므로 첫 호출이 로딩을 기다린다.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """교체 단위: 데이터셋과 그것을 만든 탭 목록, 만든 시각"""
+    dataset: object
+    sheets: tuple
+    # 실제로 불러오지 못한 탭 (다음 확인 때 다시 시도)
+    missing: tuple
+    refreshed_at: datetime
+    # 만드는 동안 나온 경고 메시지
+    problems: tuple = field(default_factory=tuple)
+
+
+class DatasetRefresher:
+    """discover()로 탭 목록을 찾고 build(sheets, warn)로 (데이터셋, 못 불러온 탭)을 만드는 갱신기"""
+
+    def __init__(self, discover, build, interval):
+        self._discover = discover
+        self._build = build
+        self.interval = interval
+        self._snapshot = None
+        # 갱신은 한 번에 하나만 (첫 로딩을 기다리는 세션들도 이 락에서 한 번만 로딩)
+        self._refresh_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self.refreshing = False
+        self.last_checked = None
+        self.last_error = None
+
+    def current(self):
+        """현재 스냅샷 (아직 없으면 이 호출에서 처음 로딩, 동시에 부른 세션들은 그 로딩을 함께 기다림)"""
+        if self._snapshot is None:
+            with self._refresh_lock:
+                if self._snapshot is None:
+                    self._refresh_locked()
+        return self._snapshot
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='dataset-refresher', daemon=True)
+            self._thread.start()
+        return self
+
+    def request_refresh(self):
+        """백그라운드 갱신을 바로 요청 (기다리지 않음)"""
+        self._wake.set()
+
+    def refresh(self):
+        """탭 목록을 확인하고 필요하면 데이터셋을 새로 만들어 교체 (교체했으면 True)"""
+        with self._refresh_lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self):
+        self.refreshing = True
+        try:
+            return self._refresh()
+        finally:
+            self.refreshing = False
+            self.last_checked = datetime.now().astimezone()
+
+    def _refresh(self):
+        problems = []
+        sheets = tuple(self._discover(problems.append))
+        current = self._snapshot
+        if current is not None:
+            new_sheets = set(sheets) - set(current.sheets)
+            if not new_sheets and not current.missing:
+                return False
+
+        start = time.perf_counter()
+        dataset, missing = self._build(sheets, problems.append)
+        if current is not None and len(dataset.merged_df) == 0:
+            # 전부 실패했으면 지금 데이터를 계속 씀
+            self.last_error = problems[-1] if problems else '데이터셋이 비어 있음'
+            logger.warning("데이터셋 갱신 실패, 기존 데이터를 유지합니다: %s", self.last_error)
+            return False
+
+        # 참조 하나를 바꾸는 것으로 교체 (읽는 쪽은 항상 완성된 스냅샷만 봄)
+        self._snapshot = Snapshot(
+            dataset=dataset,
+            sheets=sheets,
+            missing=tuple(missing),
+            refreshed_at=datetime.now().astimezone(),
+            problems=tuple(problems),
+        )
+        self.last_error = None
+        logger.info("데이터셋 교체: 탭 %d개, %.1f초", len(sheets), time.perf_counter() - start)
+        return True
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.refresh()
+            except Exception as e:
+                self.last_error = str(e)
+                logger.exception("백그라운드 데이터셋 갱신 중 오류")
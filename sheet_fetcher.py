@@ -0,0 +1,120 @@
+"""구글 시트 탭(CSV)을 병렬로 내려받는 모듈"""
+import html
+import json
+import re
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from io import BytesIO
+
+import pandas as pd
+import requests
+
+import http_cache
+
+# 동시에 내려받을 시트 수 상한 (구글 쪽 rate limit을 고려해 너무 크게 잡지 않음)
+DEFAULT_MAX_WORKERS = 8
+# 시트 하나당 요청 타임아웃(초)
+DEFAULT_TIMEOUT = 20
+# 첫 시도 이후 추가 재시도 횟수
+DEFAULT_RETRIES = 2
+# 재시도 대기 시간(초): backoff, backoff*2, backoff*4 ...
+DEFAULT_BACKOFF = 0.5
+
+
+def gviz_csv_url(sheet_id, sheet):
+    """시트 탭 이름으로 gviz CSV 다운로드 URL을 만드는 함수"""
+    return (
+        f'https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq'
+        f'?tqx=out:csv&sheet={urllib.parse.quote(sheet)}'
+    )
+
+
+def sheet_htmlview_url(sheet_id):
+    """스프레드시트 탭 목록이 담긴 htmlview 페이지 URL"""
+    return f'https://docs.google.com/spreadsheets/d/{sheet_id}/htmlview'
+
+
+# htmlview 페이지의 탭 정보: items.push({name: "24.05.22", pageUrl: ..., gid: "..."})
+_TAB_ITEM_PATTERN = re.compile(r'items\.push\(\{name:\s*"((?:[^"\\]|\\.)*)"')
+# 스크립트가 없는 경우의 탭 버튼: <li id="sheet-button-0"><a ...>24.05.22</a></li>
+_TAB_BUTTON_PATTERN = re.compile(r'id="sheet-button-[^"]*"[^>]*>\s*<a[^>]*>([^<]+)</a>')
+
+
+def _decode_js_string(value):
+    # \x3d 같은 이스케이프를 JSON 형식(\u003d)으로 바꿔서 해석
+    return json.loads('"' + re.sub(r'\\x([0-9a-fA-F]{2})', r'\\u00\1', value) + '"')
+
+
+def parse_sheet_tabs(page):
+    """htmlview 페이지 HTML에서 탭 이름을 문서 순서대로 뽑는 함수"""
+    names = [_decode_js_string(name) for name in _TAB_ITEM_PATTERN.findall(page)]
+    if not names:
+        names = [html.unescape(name).strip() for name in _TAB_BUTTON_PATTERN.findall(page)]
+    # 같은 이름이 여러 번 나와도 처음 나온 순서만 유지
+    return list(dict.fromkeys(names))
+
+
+def list_sheet_tabs(url, timeout=DEFAULT_TIMEOUT):
+    """스프레드시트의 탭 이름 목록을 한 번의 요청으로 가져오는 함수"""
+    return parse_sheet_tabs(http_cache.fetch(url, timeout).content.decode('utf-8', errors='replace'))
+
+
+@dataclass
+class SheetResult:
+    """시트 하나의 다운로드 결과 (실패 시 error에 예외가 담김)"""
+    sheet: str
+    df: pd.DataFrame = None
+    content: bytes = None
+    error: Exception = None
+    attempts: int = 0
+    elapsed: float = 0.0
+    # 서버가 304를 돌려줘서 본문을 디스크 응답 캐시에서 읽었는지
+    not_modified: bool = False
+
+
+def _is_retryable(error):
+    # 4xx 응답(잘못된 시트 이름 등)은 다시 시도해도 결과가 같으므로 재시도하지 않음
+    if isinstance(error, requests.HTTPError):
+        return error.response.status_code >= 500 or error.response.status_code == 429
+    # 연결 실패, 타임아웃 등 네트워크 오류만 재시도
+    return isinstance(error, OSError)
+
+
+def fetch_sheet(sheet, url, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF):
+    """시트 하나를 내려받아 DataFrame으로 읽는 함수 (네트워크 오류는 지수 백오프로 재시도)"""
+    start = time.perf_counter()
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            # 이전에 받은 적 있는 URL이면 조건부 요청으로 바뀌었을 때만 본문을 받음
+            response = http_cache.fetch(url, timeout)
+            df = pd.read_csv(BytesIO(response.content))
+            return SheetResult(
+                sheet, df=df, content=response.content, attempts=attempts,
+                elapsed=time.perf_counter() - start, not_modified=response.not_modified,
+            )
+        except Exception as e:
+            if attempts > retries or not _is_retryable(e):
+                return SheetResult(sheet, error=e, attempts=attempts, elapsed=time.perf_counter() - start)
+            time.sleep(backoff * (2 ** (attempts - 1)))
+
+
+def fetch_sheets(sheets, url_for, max_workers=DEFAULT_MAX_WORKERS, timeout=DEFAULT_TIMEOUT,
+                 retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF):
+    """여러 시트를 제한된 워커 풀로 동시에 내려받는 함수
+
+    결과는 완료 순서와 관계없이 입력한 sheets 순서대로 돌려준다.
+    """
+    sheets = list(sheets)
+    if not sheets:
+        return []
+
+    workers = max(1, min(max_workers, len(sheets)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(
+            lambda sheet: fetch_sheet(sheet, url_for(sheet), timeout, retries, backoff),
+            sheets,
+        ))
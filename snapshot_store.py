@@ -0,0 +1,100 @@
+"""스냅샷 시트를 로컬 디스크(Parquet)에 보관하는 저장소
+
+한 번 게시된 날짜 시트는 바뀌지 않으므로, 시트마다 Parquet 파티션 하나로 저장해 두고
+다음 로딩부터는 디스크에서 읽는다. manifest.json에는 시트별 받은 시각과 원본 CSV의
+해시를 기록한다.
+"""
+import hashlib
+import json
+import os
+import threading
+import urllib.parse
+from datetime import datetime, timezone
+
+import pandas as pd
+
+DEFAULT_ROOT = './snapshot_cache'
+MANIFEST_NAME = 'manifest.json'
+# 날짜별 시장 집계표 (dataset.compute_market_aggregates 결과)
+MARKET_NAME = 'market_aggregates.parquet'
+
+# 같은 프로세스 안에서 여러 세션이 동시에 manifest를 고쳐 쓰지 않도록 보호
+_manifest_lock = threading.Lock()
+
+
+def content_hash(content):
+    """원본 바이트의 sha256 해시"""
+    return hashlib.sha256(content).hexdigest()
+
+
+def _atomic_write(path, write):
+    # 임시 파일에 쓴 뒤 교체해서, 쓰다 만 파일이 남지 않도록 함
+    tmp_path = f'{path}.tmp'
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+class SnapshotStore:
+    """날짜 시트 하나당 Parquet 파일 하나를 두는 저장소"""
+
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+        self.manifest_path = os.path.join(root, MANIFEST_NAME)
+
+    def _partition_path(self, sheet):
+        return os.path.join(self.root, f"{urllib.parse.quote(sheet, safe='.')}.parquet")
+
+    def read_manifest(self):
+        """manifest를 읽어 {'sheets': {시트: 정보}} 형태로 돌려줌 (없거나 깨졌으면 빈 manifest)"""
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {'sheets': {}}
+        manifest.setdefault('sheets', {})
+        return manifest
+
+    def has(self, sheet):
+        return sheet in self.read_manifest()['sheets'] and os.path.exists(self._partition_path(sheet))
+
+    def missing(self, sheets):
+        """저장소에 아직 없는 시트만 입력 순서대로 골라냄"""
+        stored = self.read_manifest()['sheets']
+        return [
+            sheet for sheet in sheets
+            if sheet not in stored or not os.path.exists(self._partition_path(sheet))
+        ]
+
+    def load(self, sheet):
+        return pd.read_parquet(self._partition_path(sheet))
+
+    def save(self, sheet, df, content):
+        """시트 파티션을 쓰고 manifest에 받은 시각과 원본 해시를 기록"""
+        os.makedirs(self.root, exist_ok=True)
+        _atomic_write(self._partition_path(sheet), lambda path: df.to_parquet(path, index=False))
+
+        with _manifest_lock:
+            manifest = self.read_manifest()
+            manifest['sheets'][sheet] = {
+                'file': os.path.basename(self._partition_path(sheet)),
+                'fetched_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'sha256': content_hash(content),
+                'rows': len(df),
+            }
+
+            def write_manifest(path):
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+            _atomic_write(self.manifest_path, write_manifest)
+
+    def load_market(self):
+        """저장된 시장 집계표 (없거나 읽을 수 없으면 None)"""
+        try:
+            return pd.read_parquet(os.path.join(self.root, MARKET_NAME))
+        except Exception:
+            return None
+
+    def save_market(self, market):
+        os.makedirs(self.root, exist_ok=True)
+        _atomic_write(os.path.join(self.root, MARKET_NAME), lambda path: market.to_parquet(path))
@@ -0,0 +1,274 @@
+"""데이터 원본(백엔드)별로 날짜 스냅샷의 원본 표를 읽어 오는 모듈
+
+원본마다 읽는 방법만 다르고, 정리와 파생 지표 계산은 dataset.prepare_dataset() 한 곳에서 한다.
+모든 원본은 같은 모양으로 쓴다.
+
+- name: 아티팩트 이름 (artifact.py)
+- date(name): 스냅샷 이름의 날짜 (discover가 거르는 기준과 load가 붙이는 '날짜' 값이 같은 함수)
+- discover(warn): 읽을 수 있는 스냅샷 이름 목록 (날짜순)
+- load(names, error): 스냅샷별 원본 표 목록 ('날짜' 컬럼만 붙이고 나머지는 시트 그대로)
+- version: 같은 스냅샷 이름이라도 내용이 바뀌면 달라지는 값 (날짜 탭처럼 바뀌지 않으면 None)
+- probe(warn): 원본을 받거나 읽지 않고 알 수 있는 지금의 version (알 수 없으면 None).
+  아티팩트의 버전과 같으면 load_dataset()이 스냅샷 목록도 찾지 않고 아티팩트를 씀
+- previous_market() / save_market(market, warn): 새 날짜만 시장 집계를 하기 위한 이전 집계표
+
+    GvizSource()                  # app.py: 구글 시트 날짜 탭별 CSV
+    WorkbookSource()              # main.py: 드라이브 엑셀 통합문서 (BOODONGSAN_XLSX_PATH면 로컬 파일)
+    LocalSource('snapshots/')     # 디렉토리의 <날짜>.csv / <날짜>.parquet 파일
+"""
+import hashlib
+import logging
+import os
+from io import BytesIO
+
+import pandas as pd
+
+import http_cache
+import perf
+from artifact import LOCAL_ARTIFACT, SHEETS_ARTIFACT, WORKBOOK_ARTIFACT
+from sheet_fetcher import fetch_sheets, gviz_csv_url, list_sheet_tabs, sheet_htmlview_url
+from snapshot_store import SnapshotStore, content_hash
+from xlsx_ingest import pick_engine, read_sheets
+
+logger = logging.getLogger(__name__)
+
+# --- 구글 시트 (app.py) ---
+SHEET_ID = '1cUZ9-bMzeokaAGb84YAh--KngCM0U0-9pJgXHXrJ0U8'
+# 탭 목록은 스프레드시트에서 자동으로 찾고, 조회에 실패했을 때만 아래 목록을 사용
+FALLBACK_SHEETS = [
+    '24.05.22', '24.06.07', '24.06.18', '24.06.26', '24.07.08', '24.07.18','24.07.31', '24.08.22',
+    '24.09.25', '24.10.22','24.11.02',  '24.11.14', '24.12.10',
+    '25.01.13', '25.02.03', '25.03.02','25.04.19', '25.05.23', '25.06.09', '25.07.12', '25.07.21', '25.08.06', '25.08.30', '25.09.21', '25.10.12','25.11.08', '25.11.23'
+]
+
+# --- 드라이브 엑셀 통합문서 (main.py) ---
+# ✅ 구글 드라이브 공유 파일 ID
+FILE_ID = '여기에_ID_넣기'
+WORKBOOK_URL = f'https://drive.google.com/uc?export=download&id={FILE_ID}'
+# 로컬 엑셀 파일 경로를 지정하면 드라이브 대신 그 파일을 읽음 (부하 테스트/오프라인 실행용)
+XLSX_PATH = os.environ.get('BOODONGSAN_XLSX_PATH')
+
+
+def convert_date(date_str):
+    return pd.to_datetime('20' + date_str, format='%Y.%m.%d')
+
+
+def sheet_date(name):
+    """스냅샷 이름의 날짜 (yy.mm.dd 또는 pandas가 읽을 수 있는 날짜 형식, 아니면 ValueError)"""
+    try:
+        return convert_date(name)
+    except (ValueError, TypeError):
+        return pd.to_datetime(name)
+
+
+def _dated(names, date):
+    """date로 읽히는 이름만 날짜순으로"""
+    dated = []
+    for name in names:
+        try:
+            dated.append((date(name), name))
+        except (ValueError, TypeError):
+            continue
+    return tuple(name for _, name in sorted(dated))
+
+
+def _file_version(path):
+    # 파일 내용을 읽지 않고 크기와 수정 시각으로 버전을 정함 (바뀌면 다른 버전)
+    stat = os.stat(path)
+    return hashlib.sha256(f'{stat.st_size}:{stat.st_mtime_ns}'.encode('utf-8')).hexdigest()[:16]
+
+
+def _validator_version(etag, last_modified):
+    # 서버가 준 검증자로 정한 버전 (검증자가 없으면 None)
+    if not (etag or last_modified):
+        return None
+    return hashlib.sha256(f'{etag}|{last_modified}'.encode('utf-8')).hexdigest()[:16]
+
+
+class GvizSource:
+    """구글 시트의 날짜 탭(yy.mm.dd)을 gviz CSV로 받는 원본
+
+    이미 받아 둔 날짜 탭은 디스크(SnapshotStore)에서 읽고, 새로 생겼거나 없는 탭만 병렬로 내려받는다.
+    """
+    name = SHEETS_ARTIFACT
+    version = None
+    # 탭 이름은 yy.mm.dd만 날짜로 봄 (다른 형식의 탭은 discover에서 걸러서 요청하지 않음)
+    date = staticmethod(convert_date)
+
+    def __init__(self, sheet_id=SHEET_ID, store=None):
+        self.sheet_id = sheet_id
+        self.store = store or SnapshotStore()
+
+    def discover(self, warn=logger.warning):
+        try:
+            tabs = list_sheet_tabs(sheet_htmlview_url(self.sheet_id))
+        except Exception as e:
+            warn(f"시트 탭 목록 조회 실패, 기본 목록을 사용합니다: {e}")
+            return tuple(FALLBACK_SHEETS)
+        # 날짜 형식이 아닌 탭은 여기서 한 번만 걸러내고 요청하지 않음
+        return _dated(tabs, self.date) or tuple(FALLBACK_SHEETS)
+
+    def probe(self, warn=logger.warning):
+        # 날짜 탭은 바뀌지 않으므로 버전이 없고, 새 탭이 생겼는지는 discover로만 알 수 있음
+        return None
+
+    def load(self, names, error=logger.error):
+        missing = self.store.missing(names)
+        with perf.stage('fetch_sheets', sheets=len(missing)):
+            fetched = {
+                result.sheet: result
+                for result in fetch_sheets(missing, lambda sheet: gviz_csv_url(self.sheet_id, sheet))
+            }
+        # 시트별 다운로드 시간과 재시도 횟수 (느린 시트 찾기용)
+        for result in fetched.values():
+            perf.record(
+                'fetch_sheet', result.elapsed, sheet=result.sheet, attempts=result.attempts,
+                ok=result.error is None, not_modified=result.not_modified,
+            )
+
+        frames = []
+        for sheet in names:
+            try:
+                if sheet in fetched:
+                    result = fetched[sheet]
+                    if result.error is not None:
+                        raise result.error
+                    df = result.df
+                    try:
+                        self.store.save(sheet, df, result.content)
+                    except Exception as e:
+                        error(f"시트 '{sheet}' 로컬 저장 실패: {e}")
+                else:
+                    df = self.store.load(sheet)
+                df['날짜'] = self.date(sheet)
+                frames.append(df)
+            except Exception as e:
+                error(f"시트 '{sheet}' 로딩 중 오류 발생: {e}")
+        return frames
+
+    def previous_market(self):
+        return self.store.load_market()
+
+    def save_market(self, market, warn=logger.warning):
+        try:
+            self.store.save_market(market)
+        except Exception as e:
+            warn(f"시장 집계 로컬 저장 실패: {e}")
+
+
+class WorkbookSource:
+    """날짜별 시트로 된 엑셀 통합문서 원본 (path가 있으면 로컬 파일, 없으면 드라이브에서 다운로드)
+
+    discover()가 통합문서를 받아 두고 load()는 그 내용을 읽는다. version은 로컬 파일이면 크기와
+    수정 시각, 드라이브면 응답의 ETag/Last-Modified로 정하고 (검증자가 없으면 내용 해시),
+    probe()는 파일 정보나 HEAD 요청만으로 같은 값을 구한다.
+    """
+    name = WORKBOOK_ARTIFACT
+    date = staticmethod(sheet_date)
+
+    def __init__(self, path=XLSX_PATH, url=WORKBOOK_URL):
+        self.path = path
+        self.url = url
+        self.content = None
+        self.version = None
+
+    def download(self):
+        """통합문서 바이트 (드라이브는 바뀌지 않았으면 304만 받고 디스크 응답 캐시의 본문을 씀)"""
+        if self.path:
+            version = _file_version(self.path)
+            with open(self.path, 'rb') as f:
+                content = f.read()
+        else:
+            response = http_cache.fetch(self.url, timeout=120)
+            content = response.content
+            version = _validator_version(response.etag, response.last_modified) or content_hash(content)[:16]
+        self.content = content
+        self.version = version
+        return content
+
+    def probe(self, warn=logger.warning):
+        try:
+            if self.path:
+                return _file_version(self.path)
+            return _validator_version(*http_cache.validators(self.url))
+        except Exception as e:
+            warn(f"통합문서 버전 확인 실패: {e}")
+            return None
+
+    def discover(self, warn=logger.warning):
+        content = self.download()
+        return _dated(pd.ExcelFile(BytesIO(content), engine=pick_engine()).sheet_names, self.date)
+
+    def load(self, names, error=logger.error):
+        content = self.content if self.content is not None else self.download()
+        frames = []
+        for sheet_name, df, e in read_sheets(content, names):
+            if e is not None:
+                error(f"시트 '{sheet_name}' 처리 실패: {e}")
+                continue
+            df['날짜'] = self.date(sheet_name)
+            frames.append(df)
+        return frames
+
+    def previous_market(self):
+        return None
+
+    def save_market(self, market, warn=logger.warning):
+        pass
+
+
+class LocalSource:
+    """디렉토리 안의 <날짜>.csv / <날짜>.parquet 파일 원본 (파일 이름이 스냅샷 이름)"""
+    name = LOCAL_ARTIFACT
+    date = staticmethod(sheet_date)
+    SUFFIXES = ('.csv', '.parquet')
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.version = None
+
+    def _files(self):
+        files = {}
+        for entry in sorted(os.listdir(self.directory)):
+            stem, suffix = os.path.splitext(entry)
+            if suffix in self.SUFFIXES:
+                files[stem] = os.path.join(self.directory, entry)
+        return files
+
+    def discover(self, warn=logger.warning):
+        try:
+            files = self._files()
+        except OSError as e:
+            warn(f"스냅샷 디렉토리를 읽지 못했습니다: {e}")
+            return ()
+        names = _dated(files, self.date)
+        # 파일이 바뀌면(크기/수정 시각) 다른 버전으로 봄
+        digest = hashlib.sha256()
+        for name in names:
+            stat = os.stat(files[name])
+            digest.update(f'{name}:{stat.st_size}:{stat.st_mtime_ns};'.encode('utf-8'))
+        self.version = digest.hexdigest()[:16]
+        return names
+
+    def probe(self, warn=logger.warning):
+        # 파일 목록과 파일 정보를 함께 봐야 하므로 discover로만 알 수 있음 (디렉토리 읽기라 싼 편)
+        return None
+
+    def load(self, names, error=logger.error):
+        files = self._files()
+        frames = []
+        for name in names:
+            try:
+                path = files[name]
+                df = pd.read_parquet(path) if path.endswith('.parquet') else pd.read_csv(path)
+                df['날짜'] = self.date(name)
+                frames.append(df)
+            except Exception as e:
+                error(f"스냅샷 '{name}' 로딩 중 오류 발생: {e}")
+        return frames
+
+    def previous_market(self):
+        return None
+
+    def save_market(self, market, warn=logger.warning):
+        pass
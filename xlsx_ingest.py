@@ -0,0 +1,93 @@
+"""날짜별 시트로 된 엑셀 통합문서를 빠르게 읽는 모듈 (sources.WorkbookSource용)
+
+- python-calamine이 설치되어 있으면 openpyxl 대신 calamine 엔진으로 읽는다.
+- 시트마다 쓰는 컬럼만 읽고, 시트들은 여러 프로세스에서 나눠 읽는다.
+  (openpyxl로 나눠 읽을 수 없을 때는 시트마다 통합문서를 다시 열지 않도록 한 번에 읽는다.)
+- 값 정리와 파생 지표 계산은 하지 않는다 (dataset.prepare_dataset()에서 다른 원본과 같이 처리).
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+import pandas as pd
+
+# 시트에 있으면 읽는 컬럼 (없는 컬럼은 건너뜀)
+USE_COLUMNS = ["단지명", "매매가", "전세가", "전고점", "총세대수"]
+
+# 워커 프로세스가 공유하는 통합문서 내용 (작업마다 바이트를 다시 보내지 않도록 초기화 때 한 번만 받음)
+_worker_content = None
+_worker_engine = None
+
+
+def pick_engine():
+    """사용할 read_excel 엔진 (calamine이 없으면 pandas 기본값)"""
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return None
+    return "calamine"
+
+
+def _read_excel(content, sheet_name, engine):
+    return pd.read_excel(
+        BytesIO(content),
+        sheet_name=sheet_name,
+        engine=engine,
+        # 머리글 앞뒤 공백과 관계없이 필요한 컬럼만 읽음
+        usecols=lambda c: str(c).strip() in USE_COLUMNS,
+    )
+
+
+def _strip_columns(df):
+    df.columns = [str(c).strip() for c in df.columns]
+    return df
+
+
+def _read_sheet(content, sheet_name, engine):
+    return _strip_columns(_read_excel(content, sheet_name, engine))
+
+
+def _init_worker(content, engine):
+    global _worker_content, _worker_engine
+    _worker_content = content
+    _worker_engine = engine
+
+
+def _read_sheet_in_worker(sheet_name):
+    try:
+        return sheet_name, _read_sheet(_worker_content, sheet_name, _worker_engine), None
+    except Exception as e:
+        return sheet_name, None, e
+
+
+def read_sheets(content, sheet_names=None, max_workers=None, engine=None):
+    """통합문서 바이트의 시트들을 (병렬로) 읽어 [(시트 이름, 표, 오류)] 목록으로 돌려주는 함수"""
+    engine = engine or pick_engine()
+    if sheet_names is None:
+        sheet_names = pd.ExcelFile(BytesIO(content), engine=engine).sheet_names
+    sheet_names = list(sheet_names)
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(sheet_names)))
+
+    # fork를 쓸 수 있을 때만 프로세스로 나눔 (spawn은 main.py를 다시 import해서 다운로드가 반복됨)
+    if workers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('fork'),
+            initializer=_init_worker,
+            initargs=(content, engine),
+        ) as pool:
+            return list(pool.map(_read_sheet_in_worker, sheet_names))
+
+    if engine is None and sheet_names:
+        # openpyxl은 read_excel을 부를 때마다 통합문서 전체를 다시 여므로, 나눠 읽지 않을 때는 한 번에 읽음
+        try:
+            frames = _read_excel(content, sheet_names, engine)
+        except Exception:
+            # 어느 시트에서 실패했는지 알 수 있도록 아래에서 시트별로 다시 읽음
+            pass
+        else:
+            return [(sheet_name, _strip_columns(frames[sheet_name]), None) for sheet_name in sheet_names]
+
+    _init_worker(content, engine)
+    return [_read_sheet_in_worker(sheet_name) for sheet_name in sheet_names]